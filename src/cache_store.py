@@ -0,0 +1,65 @@
+import logging
+import zlib
+
+from requests_cache import SQLiteCache
+from requests_cache.serializers import (SerializerPipeline, Stage,
+                                        pickle_serializer)
+
+CACHE_NAME = 'http_cache'
+MEGABYTE = 1024 * 1024
+SELECT_SIZES = (
+    'SELECT key, LENGTH(value) FROM {table} '
+    'ORDER BY expires IS NULL, expires'
+)
+CACHE_TRIMMED = 'Из кеша удалено ответов: {count}, освобождено {size} байт'
+
+
+compressed_serializer = SerializerPipeline(
+    [
+        *pickle_serializer.stages,
+        Stage(zlib, dumps='compress', loads='decompress'),
+    ],
+    name='pickle-zlib',
+    is_binary=True,
+)
+
+
+def compressed_backend(db_path=CACHE_NAME):
+    """SQLite-кеш со сжатыми ответами и журналом WAL.
+
+    WAL позволяет нескольким процессам парсера читать кеш одновременно
+    с записью. Ответы, сохранённые без сжатия, под новыми ключами не
+    находятся и со временем вытесняются `trim_cache`.
+    """
+    return SQLiteCache(db_path, serializer=compressed_serializer, wal=True)
+
+
+def trim_cache(session, budget):
+    """Удаляет наименее ценные ответы, пока кеш не уложится в `budget` байт.
+
+    Первыми удаляются ответы, которые раньше других устаревают (в том
+    числе уже устаревшие), ответы без срока устаревания — последними.
+    """
+    responses = getattr(getattr(session, 'cache', None), 'responses', None)
+    if not budget or not hasattr(responses, 'connection'):
+        return
+    with responses.connection() as connection:
+        rows = connection.execute(
+            SELECT_SIZES.format(table=responses.table_name)
+        ).fetchall()
+    excess = sum(size for _, size in rows) - budget
+    evicted = []
+    for key, size in rows:
+        if excess <= 0:
+            break
+        evicted.append(key)
+        excess -= size
+    if not evicted:
+        return
+    freed = sum(size for _, size in rows[:len(evicted)])
+    session.cache.delete(*evicted)
+    logging.info(CACHE_TRIMMED.format(count=len(evicted), size=freed))
+
+
+def trim_session_cache(session, cli_args):
+    trim_cache(session, getattr(cli_args, 'cache_size', 0) * MEGABYTE)
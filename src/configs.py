@@ -1,14 +1,69 @@
 import argparse
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueListener, RotatingFileHandler
+from pathlib import Path
 
-from constants import BASE_DIR, DT_FORMAT, LOG_FORMAT
+from constants import (BASE_DIR, CACHE_EXPIRE_AFTER, CACHE_SIZE,
+                       DEFAULT_DOWNLOAD_FORMATS, DOWNLOAD_FORMATS, DT_FORMAT,
+                       EXTRACT_CACHE_MEMORY, LOG_FORMAT, LOG_FORMATS,
+                       LOG_RATE_INTERVAL, LOG_RATE_LIMIT, MAX_RETRIES,
+                       MAX_WORKERS, METRICS_FORMATS, OUTPUT_FORMATS,
+                       PARSE_PROCESSES, PEP_ENGINES, PER_HOST_LIMIT,
+                       RATE_LIMIT, READ_TIMEOUT, URLS_EXPIRE_AFTER)
+from log_handlers import (JsonFormatter, LocalQueueHandler, RateLimitFilter,
+                          set_listener_handlers, stop_listener)
+from watch import CronSchedule
+
+SHARD_ERROR = 'Шард задаётся как i/n, где 1 <= i <= n: {value}'
+POSITIVE_ERROR = 'Ожидается целое число больше нуля: {value}'
+NON_NEGATIVE_ERROR = 'Ожидается целое неотрицательное число: {value}'
+MISSING_FILE_ERROR = 'Файл не найден: {value}'
+
+
+def parse_shard(value):
+    try:
+        index, count = map(int, value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(SHARD_ERROR.format(value=value))
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(SHARD_ERROR.format(value=value))
+    return index, count
+
+
+def bounded_int(value, minimum, error):
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(error.format(value=value))
+    if number < minimum:
+        raise argparse.ArgumentTypeError(error.format(value=value))
+    return number
+
+
+def positive_int(value):
+    return bounded_int(value, 1, POSITIVE_ERROR)
+
+
+def non_negative_int(value):
+    return bounded_int(value, 0, NON_NEGATIVE_ERROR)
+
+
+def existing_file(value):
+    path = Path(value)
+    if not path.is_file():
+        raise argparse.ArgumentTypeError(
+            MISSING_FILE_ERROR.format(value=value)
+        )
+    return path
 
 
 def configure_argument_parser(available_modes):
     parser = argparse.ArgumentParser(description='Парсер документации Python')
     parser.add_argument(
         'mode',
+        nargs='+',
         choices=available_modes,
         help='Режимы работы парсера'
     )
@@ -18,25 +73,226 @@ def configure_argument_parser(available_modes):
         action='store_true',
         help='Очистка кеша'
     )
+    parser.add_argument(
+        '-r',
+        '--revalidate',
+        action='store_true',
+        help='Перепроверка всех закешированных страниц на сервере'
+    )
     parser.add_argument(
         '-o',
         '--output',
-        choices=('pretty', 'file'),
+        choices=OUTPUT_FORMATS,
         help='Дополнительные способы вывода данных'
     )
+    parser.add_argument(
+        '-w',
+        '--workers',
+        type=positive_int,
+        default=MAX_WORKERS,
+        help='Количество потоков для загрузки страниц'
+    )
+    parser.add_argument(
+        '-e',
+        '--engine',
+        choices=PEP_ENGINES,
+        default='html',
+        help='Источник статусов режима pep: страницы карточек '
+             'или api/peps.json'
+    )
+    parser.add_argument(
+        '--spot-check',
+        type=non_negative_int,
+        default=0,
+        metavar='N',
+        help='Сверить статусы из api/peps.json с N случайными карточками'
+    )
+    parser.add_argument(
+        '-f',
+        '--formats',
+        nargs='+',
+        choices=DOWNLOAD_FORMATS,
+        default=DEFAULT_DOWNLOAD_FORMATS,
+        help='Форматы архивов документации для режима download'
+    )
+    parser.add_argument(
+        '--per-host',
+        type=non_negative_int,
+        default=PER_HOST_LIMIT,
+        metavar='N',
+        help='Не больше N одновременных запросов к одному хосту '
+             '(0 - столько же, сколько потоков)'
+    )
+    parser.add_argument(
+        '-p',
+        '--processes',
+        type=non_negative_int,
+        default=PARSE_PROCESSES,
+        help='Количество процессов для разбора страниц (0 - без пула)'
+    )
+    parser.add_argument(
+        '-i',
+        '--incremental',
+        action='store_true',
+        help='Разбор только изменившихся карточек PEP'
+    )
+    parser.add_argument(
+        '-m',
+        '--metrics',
+        choices=METRICS_FORMATS,
+        help='Сохранение метрик по этапам работы в файл'
+    )
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        default=READ_TIMEOUT,
+        help='Таймаут чтения ответа, секунд'
+    )
+    parser.add_argument(
+        '--retries',
+        type=int,
+        default=MAX_RETRIES,
+        help='Количество повторов при сетевых ошибках'
+    )
+    parser.add_argument(
+        '--rate-limit',
+        type=float,
+        default=RATE_LIMIT,
+        help='Максимум запросов в секунду к одному хосту (0 - без ограничения)'
+    )
+    parser.add_argument(
+        '--log-format',
+        choices=LOG_FORMATS,
+        default='text',
+        help='Формат записей лога'
+    )
+    parser.add_argument(
+        '--log-rate-limit',
+        type=int,
+        default=LOG_RATE_LIMIT,
+        metavar='N',
+        help=f'Не больше N однотипных записей лога за {LOG_RATE_INTERVAL} с '
+             '(0 - без ограничения)'
+    )
+    parser.add_argument(
+        '--cache-size',
+        type=int,
+        default=CACHE_SIZE,
+        metavar='MB',
+        help='Предельный размер кеша страниц на диске в МБ '
+             '(0 - без ограничения)'
+    )
+    parser.add_argument(
+        '--memory-cache',
+        type=int,
+        default=EXTRACT_CACHE_MEMORY,
+        metavar='MB',
+        help='Объём памяти под кеш данных, извлечённых из страниц, в МБ'
+    )
+    snapshot_group = parser.add_mutually_exclusive_group()
+    snapshot_group.add_argument(
+        '--record',
+        type=Path,
+        help='Запись всех загруженных страниц в архив'
+    )
+    snapshot_group.add_argument(
+        '--replay',
+        type=existing_file,
+        help='Работа по архиву страниц без обращения к сети'
+    )
+    shard_group = parser.add_mutually_exclusive_group()
+    shard_group.add_argument(
+        '--shard',
+        type=parse_shard,
+        metavar='I/N',
+        help='Обработка только i-й из n частей карточек PEP '
+             'с сохранением частичного результата'
+    )
+    shard_group.add_argument(
+        '--merge',
+        action='store_true',
+        help='Объединение частичных результатов всех шардов PEP'
+    )
+    schedule_group = parser.add_mutually_exclusive_group()
+    schedule_group.add_argument(
+        '--watch',
+        type=positive_int,
+        metavar='SECONDS',
+        help='Повторять запуск через указанное число секунд, '
+             'выводя только изменения'
+    )
+    schedule_group.add_argument(
+        '--cron',
+        type=CronSchedule,
+        metavar='EXPRESSION',
+        help='Повторять запуск по cron-расписанию, выводя только изменения'
+    )
     return parser
 
 
-def configure_logging():
+def configure_logging(cli_args=None):
+    """Настраивает запись лога в файл и консоль из фонового потока.
+
+    Вызовы `logging` только кладут запись в очередь, а форматирование
+    и ввод-вывод выполняет QueueListener, поэтому лог не замедляет
+    загрузку и разбор страниц.
+    """
     log_dir = BASE_DIR / 'logs'
     log_dir.mkdir(exist_ok=True)
     log_file = log_dir / 'parser.log'
     rotating_handler = RotatingFileHandler(
         log_file, maxBytes=10 ** 6, backupCount=5
     )
-    logging.basicConfig(
-        datefmt=DT_FORMAT,
-        format=LOG_FORMAT,
-        level=logging.INFO,
-        handlers=(rotating_handler, logging.StreamHandler())
+    if getattr(cli_args, 'log_format', 'text') == 'json':
+        formatter = JsonFormatter(datefmt=DT_FORMAT)
+    else:
+        formatter = logging.Formatter(LOG_FORMAT, datefmt=DT_FORMAT)
+    handlers = (rotating_handler, logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    log_queue = queue.SimpleQueue()
+    queue_handler = LocalQueueHandler(log_queue)
+    rate_filter = RateLimitFilter(
+        getattr(cli_args, 'log_rate_limit', LOG_RATE_LIMIT), LOG_RATE_INTERVAL
+    )
+    queue_handler.addFilter(rate_filter)
+    # Записи из процессов пула проходят через тот же фильтр частоты.
+    set_listener_handlers((queue_handler,))
+    listener = QueueListener(log_queue, *handlers)
+    listener.start()
+    atexit.register(stop_listener, listener, rate_filter)
+    logging.basicConfig(level=logging.INFO, handlers=(queue_handler,))
+
+
+def configure_session(cli_args):
+    """Создаёт кеширующую сессию с политикой устаревания страниц.
+
+    Устаревшие ответы с ETag или Last-Modified перепроверяются условными
+    запросами, поэтому неизменившиеся страницы не скачиваются заново.
+    Ответы хранятся сжатыми, а кеш урезается до `--cache-size` МБ.
+    При воспроизведении архива кеш не используется, а все запросы
+    обслуживаются из архива.
+    """
+    import requests_cache
+    from cache_store import compressed_backend, trim_session_cache
+    from snapshots import mount_replay, start_recording
+    from transport import configure_transport
+
+    if cli_args.replay:
+        session = requests_cache.CachedSession(backend='memory')
+        mount_replay(session, cli_args.replay)
+        return session
+    if cli_args.record:
+        start_recording(cli_args.record)
+    session = requests_cache.CachedSession(
+        backend=compressed_backend(),
+        expire_after=CACHE_EXPIRE_AFTER,
+        urls_expire_after=URLS_EXPIRE_AFTER,
+        always_revalidate=cli_args.revalidate,
+        stale_if_error=True,
     )
+    configure_transport(session, cli_args)
+    if cli_args.clear_cache:
+        session.cache.clear()
+    trim_session_cache(session, cli_args)
+    return session
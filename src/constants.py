@@ -1,3 +1,4 @@
+from datetime import timedelta
 from pathlib import Path
 from urllib.parse import urljoin
 
@@ -6,10 +7,46 @@ BASE_DIR = Path(__file__).parent
 DATETIME_FORMAT = '%Y-%m-%d_%H-%M-%S'
 LOG_FORMAT = '"%(asctime)s - [%(levelname)s] - %(message)s"'
 DT_FORMAT = '%d.%m.%Y %H:%M:%S'
+LOG_FORMATS = ('text', 'json')
+LOG_RATE_LIMIT = 10
+LOG_RATE_INTERVAL = 60
 DOWNLOADS_URL = urljoin(MAIN_DOC_URL, 'download.html')
 DOWNLOADS_DIR = 'downloads'
+METRICS_DIR = 'metrics'
+OUTPUT_FORMATS = (
+    'pretty', 'file', 'jsonl', 'csv-gzip', 'csv-zstd', 'sqlite', 'arrow',
+    'parquet', 'delta',
+)
+OUTPUT_BATCH_SIZE = 1000
+PRETTY_SAMPLE_ROWS = 100
+PRETTY_MAX_WIDTH = 60
+EXTRACT_CACHE_MEMORY = 32
+METRICS_FORMATS = ('json', 'prometheus')
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_FORMATS = (
+    'pdf-letter.zip', 'pdf-letter.tar.bz2', 'pdf-a4.zip', 'pdf-a4.tar.bz2',
+    'html.zip', 'html.tar.bz2', 'text.zip', 'text.tar.bz2', 'epub',
+)
+DEFAULT_DOWNLOAD_FORMATS = ('pdf-a4.zip',)
 DOWNLOAD_COMPLETE_FORMAT = 'Архив был загружен и сохранён: {archive_path}'
 PEP = 'https://peps.python.org/'
+PEP_API_URL = urljoin(PEP, 'api/peps.json')
+PEP_ENGINES = ('html', 'json')
+PEP_INDEX_FILE = 'pep_index.sqlite3'
+SHARDS_DIR = 'shards'
+PEP_STATUS_PATTERN = r'Status:\s*(?P<status>[^\n]*[^\s])'
+MAX_WORKERS = 8
+PER_HOST_LIMIT = 0
+PARSE_PROCESSES = 0
+POOL_CONNECTIONS = 10
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 30
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 30
+RATE_LIMIT = 10
+CIRCUIT_BREAKER_THRESHOLD = 5
+CIRCUIT_BREAKER_COOLDOWN = 60
 EXPECTED_STATUS = {
     'A': ('Active', 'Accepted'),
     'D': ('Deferred',),
@@ -21,5 +58,18 @@ EXPECTED_STATUS = {
     '': ('Draft', 'Active'),
 }
 PEP_TABLE = [('Статус', 'Количество')]
+PEP_METADATA_TABLE = [(
+    'Номер', 'Название', 'Статус', 'Тип', 'Создан', 'Версия Python',
+    'Авторы', 'Требует', 'Обсуждение', 'Тема', 'Спонсор', 'Делегат',
+    'История обсуждения', 'Решение', 'Заменяет', 'Заменён', 'Прочие поля'
+)]
 WHATS_NEW_RESULT_TABLE = [('Ссылка на статью', 'Заголовок', 'Редактор, Автор')]
 LATEST_VERSIONS_RESULT_TABLE = [('Ссылка на документацию', 'Версия', 'Статус')]
+CACHE_EXPIRE_AFTER = timedelta(days=1)
+CACHE_SIZE = 256
+URLS_EXPIRE_AFTER = {
+    'peps.python.org/pep-*': timedelta(days=30),
+    'peps.python.org': timedelta(hours=1),
+    'docs.python.org/3/whatsnew/': timedelta(days=7),
+    'docs.python.org': timedelta(hours=1),
+}
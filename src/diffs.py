@@ -0,0 +1,42 @@
+import hashlib
+
+ADDED = 'Добавлено'
+CHANGED = 'Изменено'
+REMOVED = 'Удалено'
+CHANGE_COLUMN = 'Изменение'
+FIELD_SEPARATOR = b'\x1f'
+DIGEST_SIZE = 8
+
+
+def fingerprint(values):
+    """Короткий хеш значений строки; числа и их запись в CSV совпадают."""
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    for value in values:
+        digest.update(str(value).encode())
+        digest.update(FIELD_SEPARATOR)
+    return digest.digest()
+
+
+def diff_rows(load_previous, current):
+    """Сравнивает строки двух запусков по значению первой колонки.
+
+    `load_previous` возвращает итератор строк прошлого запуска и
+    вызывается не больше двух раз: в памяти хранятся только хеши
+    ключей и строк, а удалённые строки дочитываются вторым проходом.
+    Возвращает только добавленные, изменённые и удалённые строки,
+    дописывая в начало каждой вид изменения.
+    """
+    previous = {
+        fingerprint(row[:1]): fingerprint(row) for row in load_previous()
+    }
+    for row in current:
+        old_hash = previous.pop(fingerprint(row[:1]), None)
+        if old_hash is None:
+            yield (ADDED, *row)
+        elif old_hash != fingerprint(row):
+            yield (CHANGED, *row)
+    if not previous:
+        return
+    for row in load_previous():
+        if fingerprint(row[:1]) in previous:
+            yield (REMOVED, *row)
@@ -0,0 +1,269 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+from constants import DOWNLOAD_CHUNK_SIZE, MAX_WORKERS
+from metrics import measure, record
+from requests import RequestException, Session
+from requests_cache import CachedSession
+from snapshots import save_file
+from tqdm import tqdm
+from transport import send
+
+MANIFEST_FILE = 'manifest.json'
+OBJECTS_DIR = 'objects'
+VALIDATOR_SUFFIX = '.validator'
+ARCHIVE_PATTERN = re.compile(r'-docs[-.](?P<format>[\w.-]+)$')
+ARCHIVE_SUFFIX = re.compile(r'(\.tar)?\.\w+$')
+PARTIAL_CONTENT = 206
+NOT_MODIFIED = 304
+RANGE_NOT_SATISFIABLE = 416
+UNCHANGED = 'Архив {url} не изменился, загрузка пропущена'
+SIZE_MISMATCH = (
+    'Архив {url} повреждён: получено {size} байт вместо {expected}'
+)
+
+
+def archive_format(link):
+    """Формат архива по ссылке, например `pdf-a4.zip` или `epub`."""
+    match = ARCHIVE_PATTERN.search(link)
+    return match and match['format']
+
+
+def file_sha256(path, chunk_size=DOWNLOAD_CHUNK_SIZE):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        while chunk := file.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(downloads_dir):
+    manifest_path = downloads_dir / MANIFEST_FILE
+    if not manifest_path.exists():
+        return {}
+    return json.loads(manifest_path.read_text(encoding='utf-8'))
+
+
+def save_manifest(downloads_dir, manifest):
+    manifest_path = downloads_dir / MANIFEST_FILE
+    temp_path = manifest_path.with_suffix('.tmp')
+    temp_path.write_text(
+        json.dumps(manifest, indent=4, ensure_ascii=False), encoding='utf-8'
+    )
+    temp_path.replace(manifest_path)
+
+
+def is_intact(downloads_dir, entry):
+    """Проверяет, что сохранённый архив совпадает с манифестом."""
+    object_path = downloads_dir / entry['object']
+    return (
+        object_path.exists()
+        and object_path.stat().st_size == entry['size']
+        and file_sha256(object_path) == entry['sha256']
+    )
+
+
+def conditional_headers(entry):
+    headers = {}
+    if entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry.get('last_modified'):
+        headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+
+def expected_size(response, downloaded):
+    """Полный размер архива по заголовкам ответа или None."""
+    content_range = response.headers.get('Content-Range', '')
+    total = content_range.rpartition('/')[2]
+    if total.isdigit():
+        return int(total)
+    length = response.headers.get('Content-Length')
+    if length and length.isdigit():
+        return int(length) + downloaded
+    return None
+
+
+def range_validator(response):
+    """Значение для If-Range: сильный ETag или Last-Modified."""
+    etag = response.headers.get('ETag')
+    if etag and not etag.startswith('W/'):
+        return etag
+    return response.headers.get('Last-Modified')
+
+
+def resume_headers(part_path, validator_path):
+    """Размер недокачанного архива и заголовки для его докачки.
+
+    Без сохранённого валидатора докачка небезопасна: к началу старого
+    архива дописался бы конец нового, поэтому `.part` удаляется.
+    С If-Range изменившийся архив сервер отдаёт целиком.
+    """
+    if not part_path.exists():
+        return 0, {}
+    if not validator_path.exists():
+        part_path.unlink()
+        return 0, {}
+    return part_path.stat().st_size, {
+        'Range': f'bytes={part_path.stat().st_size}-',
+        'If-Range': validator_path.read_text(encoding='utf-8'),
+    }
+
+
+def start_part(response, validator_path):
+    """Запоминает валидатор архива, загрузка которого начата заново."""
+    validator = range_validator(response)
+    if validator:
+        validator_path.write_text(validator, encoding='utf-8')
+    else:
+        validator_path.unlink(missing_ok=True)
+
+
+def uncached(session):
+    """Сессия без кеша ответов, которая отправляет запросы через те же
+    адаптеры, что и `session`.
+
+    Флаг `cache_disabled` общий для всей сессии и не подходит для
+    параллельных загрузок, поэтому архивы загружаются отдельной сессией.
+    """
+    if not isinstance(session, CachedSession):
+        return session
+    plain_session = Session()
+    plain_session.headers = session.headers
+    plain_session.adapters = session.adapters
+    return plain_session
+
+
+def link_object(object_path, path):
+    """Кладёт архив под его обычным именем, не копируя содержимое."""
+    path.unlink(missing_ok=True)
+    try:
+        os.link(object_path, path)
+    except OSError:
+        shutil.copyfile(object_path, path)
+
+
+def write_part(response, part_path, downloaded, position):
+    with open(part_path, 'ab' if downloaded else 'wb') as file, tqdm(
+        total=expected_size(response, downloaded),
+        initial=downloaded,
+        unit='B',
+        unit_scale=True,
+        unit_divisor=1024,
+        desc=part_path.stem,
+        position=position,
+    ) as progress:
+        for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+            file.write(chunk)
+            progress.update(len(chunk))
+            record('fetch', bytes=len(chunk))
+
+
+def store_object(downloads_dir, part_path, path):
+    """Переносит скачанный архив в хранилище по хешу содержимого."""
+    sha256 = file_sha256(part_path)
+    objects_dir = downloads_dir / OBJECTS_DIR
+    objects_dir.mkdir(exist_ok=True)
+    suffix = ARCHIVE_SUFFIX.search(path.name)[0]
+    object_path = objects_dir / f'{sha256}{suffix}'
+    if object_path.exists():
+        part_path.unlink()
+    else:
+        part_path.replace(object_path)
+    link_object(object_path, path)
+    return {
+        'object': object_path.relative_to(downloads_dir).as_posix(),
+        'sha256': sha256,
+        'size': object_path.stat().st_size,
+    }
+
+
+def fetch_archive(session, url, downloads_dir, entry=None, position=0):
+    """Скачивает архив, если он изменился, и возвращает запись манифеста.
+
+    Недокачанный архив хранится с суффиксом `.part` и докачивается
+    заголовками Range и If-Range; целый архив перепроверяется условным
+    запросом. При ошибке возвращает None.
+    """
+    path = downloads_dir / url.split('/')[-1]
+    part_path = path.with_name(path.name + '.part')
+    validator_path = part_path.with_name(part_path.name + VALIDATOR_SUFFIX)
+    downloaded, headers = resume_headers(part_path, validator_path)
+    if not downloaded and entry is not None and is_intact(
+        downloads_dir, entry
+    ):
+        headers = conditional_headers(entry)
+    try:
+        with measure('fetch'):
+            response = send(session, url, headers=headers, stream=True)
+        with response, measure('fetch'):
+            if response.status_code == NOT_MODIFIED:
+                logging.info(UNCHANGED.format(url=url))
+                link_object(downloads_dir / entry['object'], path)
+                return entry
+            if response.status_code != RANGE_NOT_SATISFIABLE:
+                response.raise_for_status()
+                if response.status_code != PARTIAL_CONTENT:
+                    downloaded = 0
+                    start_part(response, validator_path)
+                write_part(response, part_path, downloaded, position)
+            size = expected_size(response, downloaded)
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+    except RequestException:
+        logging.exception(f'Возникла ошибка при загрузке файла {url}')
+        return None
+    if size is not None and part_path.stat().st_size != size:
+        logging.error(SIZE_MISMATCH.format(
+            url=url, size=part_path.stat().st_size, expected=size
+        ))
+        part_path.unlink()
+        validator_path.unlink(missing_ok=True)
+        return None
+    entry = store_object(downloads_dir, part_path, path)
+    validator_path.unlink(missing_ok=True)
+    entry.update(name=path.name, etag=etag, last_modified=last_modified)
+    save_file(url, path)
+    return entry
+
+
+def prune_objects(downloads_dir, manifest):
+    """Удаляет из хранилища архивы, на которые не ссылается манифест."""
+    objects_dir = downloads_dir / OBJECTS_DIR
+    if not objects_dir.exists():
+        return
+    referenced = {entry['object'] for entry in manifest.values()}
+    for object_path in objects_dir.iterdir():
+        if object_path.relative_to(downloads_dir).as_posix() not in referenced:
+            object_path.unlink()
+
+
+def download_archives(session, urls, downloads_dir, workers=MAX_WORKERS):
+    """Параллельно скачивает архивы и обновляет манифест.
+
+    Возвращает пути к архивам, которые удалось скачать или проверить.
+    """
+    manifest = load_manifest(downloads_dir)
+    session = uncached(session)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            url: executor.submit(
+                fetch_archive, session, url, downloads_dir,
+                manifest.get(url), position
+            )
+            for position, url in enumerate(urls)
+        }
+    paths = []
+    for url, future in futures.items():
+        entry = future.result()
+        if entry is not None:
+            manifest[url] = entry
+            paths.append(downloads_dir / entry['name'])
+    save_manifest(downloads_dir, manifest)
+    prune_objects(downloads_dir, manifest)
+    return paths
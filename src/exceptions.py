@@ -1,3 +1,26 @@
+from requests import RequestException
+
+
 class ParserFindTagException(Exception):
     """Вызывается, когда парсер не может найти тег."""
     pass
+
+
+class CircuitBreakerOpenException(RequestException):
+    """Вызывается, когда запросы к хосту временно приостановлены."""
+    pass
+
+
+class MissingDependencyException(Exception):
+    """Вызывается, когда для выбранного вывода не установлен пакет."""
+    pass
+
+
+class SnapshotMissException(RequestException):
+    """Вызывается, когда в архиве для воспроизведения нет страницы."""
+    pass
+
+
+class ShardMergeException(Exception):
+    """Вызывается, когда результаты шардов нельзя объединить."""
+    pass
@@ -0,0 +1,92 @@
+import hashlib
+import pickle
+from collections import OrderedDict
+from concurrent.futures import Future
+from threading import Lock
+
+from constants import EXTRACT_CACHE_MEMORY
+
+MISSING = object()
+MEGABYTE = 1024 * 1024
+KEY_OVERHEAD = 128
+
+
+class ExtractCache:
+    """LRU-кеш данных, извлечённых из страниц, с ограничением по памяти.
+
+    Ключ — функция разбора, адрес и хеш содержимого страницы, поэтому
+    изменившаяся страница разбирается заново. Хранятся только
+    результаты разбора, а не деревья BeautifulSoup.
+    """
+
+    def __init__(self, budget=EXTRACT_CACHE_MEMORY * MEGABYTE):
+        self.budget = budget
+        self.size = 0
+        self.lock = Lock()
+        self.items = OrderedDict()
+
+    def get(self, key, default=MISSING):
+        with self.lock:
+            item = self.items.get(key)
+            if item is None:
+                return default
+            self.items.move_to_end(key)
+            return item[0]
+
+    def put(self, key, value):
+        size = len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        size += KEY_OVERHEAD
+        if size > self.budget:
+            return
+        with self.lock:
+            old_item = self.items.pop(key, None)
+            if old_item is not None:
+                self.size -= old_item[1]
+            self.items[key] = value, size
+            self.size += size
+            while self.size > self.budget:
+                _, (_, evicted_size) = self.items.popitem(last=False)
+                self.size -= evicted_size
+
+
+EXTRACT_CACHE = ExtractCache()
+
+
+def configure_extract_cache(memory):
+    global EXTRACT_CACHE
+    EXTRACT_CACHE = ExtractCache(memory * MEGABYTE)
+
+
+def extract_key(parse, response):
+    content_hash = hashlib.blake2b(response.content, digest_size=16)
+    return (
+        parse.__module__,
+        parse.__qualname__,
+        response.url,
+        content_hash.digest(),
+    )
+
+
+def cached_parse(parse, response):
+    """Результат `parse` для страницы; повторный разбор берётся из кеша."""
+    key = extract_key(parse, response)
+    result = EXTRACT_CACHE.get(key)
+    if result is MISSING:
+        result = parse(response.text)
+        EXTRACT_CACHE.put(key, result)
+    return result
+
+
+def submit_cached_parse(executor, parse, response):
+    """Как `cached_parse`, но разбор промаха выполняется в `executor`."""
+    key = extract_key(parse, response)
+    result = EXTRACT_CACHE.get(key)
+    if result is not MISSING:
+        future = Future()
+        future.set_result(result)
+        return future
+    future = executor.submit(parse, response.text)
+    future.add_done_callback(
+        lambda done: done.exception() or EXTRACT_CACHE.put(key, done.result())
+    )
+    return future
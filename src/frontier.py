@@ -0,0 +1,93 @@
+import posixpath
+from concurrent.futures import Future
+from contextlib import contextmanager
+from threading import Lock
+from urllib.parse import urlsplit, urlunsplit
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url):
+    """Приводит адрес к одному виду, чтобы дубликаты совпадали.
+
+    Схема и хост переводятся в нижний регистр, стандартный порт, якорь
+    и сегменты `.`/`..` в пути отбрасываются.
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port is not None and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f'{host}:{parts.port}'
+    path = posixpath.normpath(parts.path) if parts.path else '/'
+    if parts.path.endswith('/') and not path.endswith('/'):
+        path += '/'
+    return urlunsplit((scheme, host, path, parts.query, ''))
+
+
+class Frontier:
+    """Загрузки страниц, которые выполняются прямо сейчас, и редиректы.
+
+    Готовые ответы не хранятся: повторную загрузку страницы обслуживает
+    кеш сессии, поэтому память не растёт с числом страниц запуска.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.pending = {}
+        self.aliases = {}
+
+    def once(self, key, load):
+        """Вызывает `load` один раз для одновременных запросов адреса."""
+        with self.lock:
+            future = self.pending.get(key)
+            owner = future is None
+            if owner:
+                future = self.pending[key] = Future()
+        if not owner:
+            return future.result()
+        try:
+            result = load()
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            with self.lock:
+                del self.pending[key]
+        return result
+
+    def fetch(self, url, load):
+        """Загружает страницу, запоминая итоговый адрес редиректа.
+
+        Следующие запросы адреса, который перенаправил на другой, сразу
+        загружают страницу по итоговому адресу.
+        """
+        key = normalize_url(url)
+        with self.lock:
+            target = self.aliases.get(key, url)
+        response = self.once(normalize_url(target), lambda: load(target))
+        if response is not None and normalize_url(response.url) != key:
+            with self.lock:
+                self.aliases[key] = response.url
+        return response
+
+
+FRONTIER = None
+
+
+@contextmanager
+def shared_pages():
+    """Включает общую загрузку страниц на время запуска режимов."""
+    global FRONTIER
+    FRONTIER = Frontier()
+    try:
+        yield FRONTIER
+    finally:
+        FRONTIER = None
+
+
+def fetch_once(url, load):
+    if FRONTIER is None:
+        return load(url)
+    return FRONTIER.fetch(url, load)
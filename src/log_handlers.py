@@ -0,0 +1,145 @@
+import atexit
+import json
+import logging
+import time
+from logging.handlers import QueueHandler, QueueListener
+from threading import Lock
+
+SUPPRESSED_FORMAT = '{message} (пропущено похожих сообщений: {count})'
+LISTENER_HANDLERS = ()
+WORKER_QUEUE = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Форматирует записи лога как JSON, по объекту на строку."""
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record, self.datefmt),
+            'level': record.levelname,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class LocalQueueHandler(QueueHandler):
+    """Кладёт запись в очередь без форматирования.
+
+    Слушатель очереди работает в том же процессе, поэтому запись
+    не нужно готовить к передаче: сообщение и трассировку форматируют
+    обработчики слушателя в фоновом потоке.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class RateLimitFilter(logging.Filter):
+    """Пропускает не больше `limit` предупреждений и ошибок за `interval`
+    секунд с одного места вызова, чтобы однотипные ошибки по каждой
+    странице не забивали лог. Записи уровня INFO и ниже не ограничиваются.
+    Число отброшенных записей дописывается к следующей пропущенной,
+    а оставшееся — в конце работы через `pop_suppressed`.
+    """
+
+    def __init__(self, limit, interval):
+        super().__init__()
+        self.limit = limit
+        self.interval = interval
+        self.lock = Lock()
+        self.windows = {}
+
+    def filter(self, record):
+        if not self.limit or record.levelno < logging.WARNING:
+            return True
+        key = (record.pathname, record.lineno, record.levelno)
+        now = time.monotonic()
+        with self.lock:
+            started, count, suppressed, _ = self.windows.get(
+                key, (now, 0, 0, None)
+            )
+            if now - started >= self.interval:
+                started, count = now, 0
+            if count >= self.limit:
+                self.windows[key] = started, count, suppressed + 1, record
+                return False
+            self.windows[key] = started, count + 1, 0, None
+        if suppressed:
+            mark_suppressed(record, suppressed)
+        return True
+
+    def pop_suppressed(self):
+        """Отброшенные записи, о которых лог ещё не сообщил.
+
+        По каждому месту вызова возвращается последняя отброшенная запись
+        с дописанным числом отброшенных.
+        """
+        with self.lock:
+            windows, self.windows = self.windows, {}
+        return [
+            mark_suppressed(record, suppressed)
+            for _, _, suppressed, record in windows.values() if suppressed
+        ]
+
+
+def mark_suppressed(record, count):
+    record.msg = SUPPRESSED_FORMAT.format(
+        message=record.getMessage(), count=count
+    )
+    record.args = None
+    return record
+
+
+def stop_listener(listener, rate_filter):
+    """Останавливает слушателя, сообщив в лог об отброшенных записях."""
+    for record in rate_filter.pop_suppressed():
+        listener.queue.put_nowait(record)
+    listener.stop()
+
+
+def set_listener_handlers(handlers):
+    """Запоминает обработчики для записей из процессов пула."""
+    global LISTENER_HANDLERS
+    LISTENER_HANDLERS = handlers
+
+
+def worker_queue():
+    """Очередь записей лога из процессов пула или None без настройки лога.
+
+    Слушатель очереди запускается в основном процессе при первом вызове
+    и передаёт записи обработчикам из `set_listener_handlers`.
+    """
+    global WORKER_QUEUE
+    if WORKER_QUEUE is None and LISTENER_HANDLERS:
+        import multiprocessing
+
+        WORKER_QUEUE = multiprocessing.Queue()
+        listener = QueueListener(WORKER_QUEUE, *LISTENER_HANDLERS)
+        listener.start()
+        atexit.register(listener.stop)
+    return WORKER_QUEUE
+
+
+def init_worker(log_queue):
+    """Направляет лог процесса пула в очередь основного процесса.
+
+    Унаследованный при fork LocalQueueHandler пишет в копию очереди,
+    которую в дочернем процессе никто не читает.
+    """
+    if log_queue is None:
+        return
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(logging.INFO)
+
+
+def worker_logging():
+    """Аргументы пула процессов, настраивающие в нём лог."""
+    return {
+        'initializer': init_worker,
+        'initargs': (worker_queue(),),
+    }
@@ -1,18 +1,27 @@
+import json
 import logging
+import random
 import re
+from argparse import Namespace
 from urllib.parse import urljoin
 from collections import defaultdict
 
-import requests_cache
-from bs4 import BeautifulSoup
-from configs import configure_argument_parser, configure_logging
-from constants import (BASE_DIR, EXPECTED_STATUS, LATEST_VERSIONS_RESULT_TABLE,
-                       MAIN_DOC_URL, PEP, WHATS_NEW_RESULT_TABLE,
-                       DOWNLOADS_DIR, DOWNLOADS_URL,
-                       DOWNLOAD_COMPLETE_FORMAT)
-from outputs import control_output
-from tqdm import tqdm
-from utils import find_tag, get_response
+from configs import (configure_argument_parser, configure_logging,
+                     configure_session)
+from constants import (BASE_DIR, DEFAULT_DOWNLOAD_FORMATS,
+                       LATEST_VERSIONS_RESULT_TABLE,
+                       MAIN_DOC_URL, MAX_WORKERS, PARSE_PROCESSES, PEP,
+                       PEP_API_URL, PER_HOST_LIMIT,
+                       PEP_INDEX_FILE, PEP_METADATA_TABLE, PEP_TABLE,
+                       SHARDS_DIR, WHATS_NEW_RESULT_TABLE, DOWNLOADS_DIR,
+                       DOWNLOADS_URL, DOWNLOAD_COMPLETE_FORMAT)
+from extract_cache import cached_parse, configure_extract_cache
+from metrics import report
+from pep_metadata import PepRecord
+from pep_index import get_status, open_index, status_counts, utc_now
+
+# requests, bs4 и tqdm импортируются внутри функций режимов: так `--help`
+# и разбор аргументов не тратят время на загрузку тяжёлых зависимостей.
 
 PARSER_ERROR = ('Сбой в работе программы: {error}')
 INCONGRUITY_STATUSES_FORMAT = (
@@ -26,41 +35,83 @@ STATUS_MISSMATCH_ERROR = (
     'Статус в картрочке {status}\n'
     'Ожидаемые статусы: {preview_status}'
 )
+PEP_API_FALLBACK = (
+    'Не удалось получить статусы из {url}, карточки PEP будут загружены '
+    'со страниц'
+)
+SPOT_CHECK_MISMATCH = (
+    'Статус {link} в api/peps.json ({api_status}) не совпадает '
+    'со статусом в карточке ({status})'
+)
 FILE_UPLOAD_LOG = ('Архив был загружен и сохранён: {archive_path}')
+VERSION_PATTERN = re.compile(r'Python (?P<version>\d\.\d+) \((?P<status>.*)\)')
 
 
-def whats_new(session):
-    whats_new_url = urljoin(MAIN_DOC_URL, 'whatsnew/')
-    response = get_response(session, whats_new_url)
-    if response is None:
-        return
-    soup = BeautifulSoup(response.text, features='lxml')
+def fetch_pages(session, links, cli_args):
+    """Загружает страницы с числом потоков и лимитом на хост из аргументов."""
+    from utils import fetch_all
+
+    return fetch_all(
+        session,
+        links,
+        workers=getattr(cli_args, 'workers', MAX_WORKERS),
+        per_host=getattr(cli_args, 'per_host', PER_HOST_LIMIT)
+    )
+
+
+def parse_whats_new_page(text):
+    from utils import find_tag, get_soup
+
+    soup = get_soup(text, 'whats-new-page')
+    h1 = find_tag(soup, 'h1')
+    dl = find_tag(soup, 'dl')
+    return h1.text, dl.text.replace('\n', ' ')
+
+
+def parse_whats_new_index(text):
+    from utils import find_tag, get_soup
+
+    soup = get_soup(text, 'whats-new-index')
     main_div = find_tag(soup, 'section', attrs={'id': 'what-s-new-in-python'})
     div_with_ul = find_tag(main_div, 'div', attrs={'class': 'toctree-wrapper'})
     sections_by_python = div_with_ul.find_all(
         'li', attrs={'class': 'toctree-l1'}
     )
-    results = WHATS_NEW_RESULT_TABLE
-    for section in tqdm(sections_by_python):
-        version_a_tag = find_tag(section, 'a')
-        href = version_a_tag['href']
-        version_link = urljoin(whats_new_url, href)
-        response = get_response(session, version_link)
-        if response is None:
-            continue
-        soup = BeautifulSoup(response.text, features='lxml')
-        h1 = find_tag(soup, 'h1')
-        dl = find_tag(soup, 'dl')
-        dl_text = dl.text.replace('\n', ' ')
-        results.append((version_link, h1.text, dl_text))
-    return results
+    return [find_tag(section, 'a')['href'] for section in sections_by_python]
 
 
-def latest_versions(session):
-    response = get_response(session, MAIN_DOC_URL)
+def whats_new(session, cli_args=None):
+    from tqdm import tqdm
+    from utils import get_response, parse_all
+
+    whats_new_url = urljoin(MAIN_DOC_URL, 'whatsnew/')
+    response = get_response(session, whats_new_url)
     if response is None:
         return
-    soup = BeautifulSoup(response.text, 'lxml')
+    version_links = [
+        urljoin(whats_new_url, href)
+        for href in cached_parse(parse_whats_new_index, response)
+    ]
+    responses = fetch_pages(session, version_links, cli_args)
+    pages = parse_all(
+        parse_whats_new_page,
+        responses,
+        processes=getattr(cli_args, 'processes', PARSE_PROCESSES)
+    )
+    yield from WHATS_NEW_RESULT_TABLE
+    for version_link, page in tqdm(
+        zip(version_links, pages), total=len(version_links)
+    ):
+        if page is None:
+            continue
+        h1_text, dl_text = page
+        yield version_link, h1_text, dl_text
+
+
+def parse_latest_versions(text):
+    from utils import find_tag, get_soup
+
+    soup = get_soup(text, 'latest-versions')
     sidebar = find_tag(soup, 'div', attrs={'class': 'sphinxsidebarwrapper'})
     ul_tags = sidebar.find_all('ul')
     for ul in ul_tags:
@@ -69,74 +120,268 @@ def latest_versions(session):
             break
     else:
         raise Exception('Ничего не нашлось')
-    results = LATEST_VERSIONS_RESULT_TABLE
-    pattern = r'Python (?P<version>\d\.\d+) \((?P<status>.*)\)'
+    rows = []
     for a_tag in a_tags:
         link = a_tag['href']
-        text_match = re.search(pattern, a_tag.text)
+        text_match = VERSION_PATTERN.search(a_tag.text)
         if text_match is not None:
             version, status = text_match.groups()
         else:
             version, status = a_tag.text, ''
-        results.append(
-            (link, version, status)
-        )
-    return results
+        rows.append((link, version, status))
+    return rows
+
+
+def latest_versions(session, cli_args=None):
+    from utils import get_response
 
+    response = get_response(session, MAIN_DOC_URL)
+    if response is None:
+        return
+    rows = cached_parse(parse_latest_versions, response)
+    yield from LATEST_VERSIONS_RESULT_TABLE
+    yield from rows
+
+
+def parse_download_links(text):
+    from utils import get_soup
+
+    soup = get_soup(text, 'download')
+    return [a['href'] for a in soup.select('table.docutils a[href]')]
+
+
+def download(session, cli_args=None):
+    from downloads import archive_format, download_archives
+    from utils import get_response
 
-def download(session):
     response = get_response(session, DOWNLOADS_URL)
-    soup = BeautifulSoup(response.text, features='lxml')
-    pdf_a4_link = soup.select_one('table.docutils a[href$="pdf-a4.zip"]')[
-        'href'
-    ]
-    archive_url = urljoin(DOWNLOADS_URL, pdf_a4_link)
-    filename = archive_url.split('/')[-1]
-    response = session.get(archive_url)
     if response is None:
         return
+    formats = getattr(cli_args, 'formats', DEFAULT_DOWNLOAD_FORMATS)
+    archive_urls = [
+        urljoin(DOWNLOADS_URL, link)
+        for link in cached_parse(parse_download_links, response)
+        if archive_format(link) in formats
+    ]
     downloads_dir = BASE_DIR / DOWNLOADS_DIR
     downloads_dir.mkdir(exist_ok=True)
-    with open(downloads_dir / filename, 'wb') as file:
-        file.write(response.content)
-    logging.info(DOWNLOAD_COMPLETE_FORMAT.format(archive_path=downloads_dir))
+    for archive_path in download_archives(
+        session, archive_urls, downloads_dir,
+        workers=getattr(cli_args, 'workers', MAX_WORKERS)
+    ):
+        logging.info(
+            DOWNLOAD_COMPLETE_FORMAT.format(archive_path=archive_path)
+        )
+
+
+def parse_pep_metadata(text):
+    from utils import find_tag, get_soup
+
+    soup = get_soup(text, 'pep-metadata')
+    h1 = find_tag(soup, 'h1', {'class': 'page-title'})
+    table = find_tag(soup, 'dl', {'class': 'field-list'})
+    fields = [
+        (dt.text.rstrip(':'), dt.find_next_sibling('dd').text)
+        for dt in table.find_all('dt')
+    ]
+    return PepRecord.from_card(h1.text, fields)
 
 
-def pep(session):
+def parse_pep_index(text):
+    from pep_status import preview_status
+    from utils import find_tag, get_soup
+
+    soup = get_soup(text, 'pep-index')
+    numerical_index = find_tag(soup, 'section', {'id': 'numerical-index'})
+    rows = find_tag(numerical_index, 'tbody').find_all('tr')
+    preview_statuses = [preview_status(row) for row in rows]
+    links = [urljoin(PEP, find_tag(row, 'a')['href']) for row in rows]
+    return links, preview_statuses
+
+
+def get_pep_index(session):
+    """Возвращает ссылки на карточки PEP и их статусы из общего списка."""
+    from utils import get_response
+
     response = get_response(session, PEP)
-    result = [('Статус', 'Количество')]
-    soup = BeautifulSoup(response.text, features='lxml')
-    all_tables = soup.find('section', id='numerical-index')
-    all_tables = all_tables.find_all('tr')
-    status_sum = defaultdict()
-    error_messages = []
-    for table in tqdm(all_tables, desc='Parsing'):
-        preview_status_column = find_tag(table, 'td')
-        preview_status = preview_status_column.text[1:]
-        link = urljoin(PEP, find_tag(table, 'a')['href'])
-        response = get_response(session, link)
-        soup = BeautifulSoup(response.text, features='lxml')
-        section = find_tag(soup, 'section', {'id': 'pep-content'})
-        table = find_tag(section, 'dl', {'class': 'field-list'})
-        re_text = re.search(table.text)
-        status = None
+    if response is None:
+        return None
+    return cached_parse(parse_pep_index, response)
+
+
+def parse_pep_api(text):
+    """Статусы всех PEP из `api/peps.json` по ссылкам на карточки."""
+    return {
+        urljoin(PEP, f'pep-{int(number):04d}/'): pep['status'] or None
+        for number, pep in json.loads(text).items()
+    }
+
+
+def load_api_statuses(session):
+    from utils import get_response
+
+    response = get_response(session, PEP_API_URL)
+    if response is None:
+        return None
+    try:
+        return dict(cached_parse(parse_pep_api, response))
+    except (ValueError, KeyError, TypeError, AttributeError):
+        logging.exception(f'Не удалось разобрать {PEP_API_URL}')
+        return None
+
+
+def card_statuses(links, responses, cli_args, index):
+    from pep_status import parse_status
+    from utils import parse_all
+
+    if index is None:
+        return parse_all(
+            parse_status,
+            responses,
+            processes=getattr(cli_args, 'processes', PARSE_PROCESSES)
+        )
+    return (
+        None if response is None
+        else get_status(index, link, response, parse_status)
+        for link, response in zip(links, responses)
+    )
+
+
+def scraped_statuses(session, links, cli_args, index=None):
+    responses = fetch_pages(session, links, cli_args)
+    return card_statuses(links, responses, cli_args, index)
+
+
+def spot_check(session, links, statuses, cli_args):
+    """Сверяет статусы из API с карточками из случайной выборки."""
+    sample = random.sample(
+        links, min(getattr(cli_args, 'spot_check', 0), len(links))
+    )
+    for link, status in zip(
+        sample, scraped_statuses(session, sample, cli_args)
+    ):
+        if status is not None and status != statuses[link]:
+            logging.warning(SPOT_CHECK_MISMATCH.format(
+                link=link, api_status=statuses[link], status=status
+            ))
+
+
+def api_statuses(session, links, cli_args):
+    """Статусы карточек из `api/peps.json` одним запросом.
+
+    Карточки, которых нет в API, а при сбое API и все карточки,
+    разбираются со страниц.
+    """
+    statuses = load_api_statuses(session)
+    if statuses is None:
+        logging.warning(PEP_API_FALLBACK.format(url=PEP_API_URL))
+        return scraped_statuses(session, links, cli_args)
+    missing = [link for link in links if link not in statuses]
+    if missing:
+        statuses.update(
+            zip(missing, scraped_statuses(session, missing, cli_args))
+        )
+    spot_check(session, links, statuses, cli_args)
+    return [statuses[link] for link in links]
+
+
+def count_statuses(session, cli_args):
+    """Считает статусы карточек PEP и несовпадения с общим списком.
+
+    Если задан шард, обрабатываются только относящиеся к нему карточки.
+    """
+    from pep_status import is_expected
+    from shards import in_shard
+    from tqdm import tqdm
+
+    pep_index = get_pep_index(session)
+    if pep_index is None:
+        return None
+    links, preview_statuses = pep_index
+    shard = getattr(cli_args, 'shard', None)
+    if shard is not None:
+        rows = [row for row in zip(*pep_index) if in_shard(row[0], shard)]
+        links = [link for link, _ in rows]
+        preview_statuses = [abbreviation for _, abbreviation in rows]
+    index = None
+    if getattr(cli_args, 'engine', 'html') == 'json':
+        statuses = api_statuses(session, links, cli_args)
+    else:
+        if getattr(cli_args, 'incremental', False):
+            index = open_index(BASE_DIR / PEP_INDEX_FILE)
+            started_at = utc_now()
+        statuses = scraped_statuses(session, links, cli_args, index)
+    status_sum = defaultdict(int)
+    mismatches = []
+    for link, abbreviation, status in tqdm(
+        zip(links, preview_statuses, statuses),
+        total=len(links),
+        desc='Parsing'
+    ):
+        if status is None:
+            continue
         status_sum[status] += 1
-        if re_text:
-            status = re_text.group('status')
-        if preview_status and EXPECTED_STATUS.get(preview_status) != status:
-            error_message = (
-                'Несовпадающие статусы:\n'
-                f'{link}\n'
-                f'Статус в картрочке {status}\n'
-                f'Ожидаемые статусы: {EXPECTED_STATUS[preview_status]}')
-            error_messages.append(error_message)
-
-    if error_messages:
-        error_log = '\n'.join(error_messages)
-        logging.warning(error_log)
-    result.extend(status_sum.items())
-    result.append(('Total', sum(status_sum.values())))
-    return result
+        if not is_expected(abbreviation, status):
+            mismatches.append((link, status, abbreviation))
+    if index is not None:
+        index.commit()
+        status_sum = status_counts(index, started_at)
+        index.close()
+    return dict(status_sum), mismatches
+
+
+def log_mismatches(mismatches):
+    from pep_status import expected_statuses
+
+    if mismatches:
+        logging.warning('\n'.join(
+            STATUS_MISSMATCH_ERROR.format(
+                pep_link=link,
+                status=status,
+                preview_status=expected_statuses(abbreviation)
+            )
+            for link, status, abbreviation in mismatches
+        ))
+
+
+def pep(session, cli_args=None):
+    from shards import merge_shards, save_shard
+
+    shards_dir = BASE_DIR / SHARDS_DIR
+    shard = getattr(cli_args, 'shard', None)
+    if getattr(cli_args, 'merge', False):
+        status_sum, mismatches = merge_shards(shards_dir)
+    else:
+        counted = count_statuses(session, cli_args)
+        if counted is None:
+            return
+        status_sum, mismatches = counted
+        if shard is not None:
+            save_shard(shards_dir, shard, status_sum, mismatches)
+    log_mismatches(mismatches)
+    yield from PEP_TABLE
+    yield from status_sum.items()
+    yield 'Total', sum(status_sum.values())
+
+
+def pep_metadata(session, cli_args=None):
+    from tqdm import tqdm
+    from utils import parse_all
+
+    pep_index = get_pep_index(session)
+    if pep_index is None:
+        return
+    links, _ = pep_index
+    responses = fetch_pages(session, links, cli_args)
+    records = parse_all(
+        parse_pep_metadata,
+        responses,
+        processes=getattr(cli_args, 'processes', PARSE_PROCESSES)
+    )
+    yield from PEP_METADATA_TABLE
+    for record in tqdm(records, total=len(links), desc='Parsing'):
+        if record is not None:
+            yield record.as_row()
 
 
 MODE_TO_FUNCTION = {
@@ -144,23 +389,50 @@ MODE_TO_FUNCTION = {
     'latest-versions': latest_versions,
     'download': download,
     'pep': pep,
+    'pep-metadata': pep_metadata,
 }
 
 
+def mode_runs(cli_args):
+    """Аргументы и функция каждого из запрошенных режимов без повторов."""
+    for mode in dict.fromkeys(cli_args.mode):
+        yield Namespace(**{**vars(cli_args), 'mode': mode}), (
+            MODE_TO_FUNCTION[mode]
+        )
+
+
+def run_modes(runs, session):
+    """Запускает режимы по очереди с общей загрузкой страниц."""
+    from frontier import shared_pages
+    from outputs import control_output
+
+    with shared_pages():
+        for mode_args, mode_function in runs:
+            results = mode_function(session, mode_args)
+            if results is not None:
+                control_output(results, mode_args)
+            report(mode_args)
+
+
 def main():
-    configure_logging()
-    logging.info('Парсер запущен!')
     arg_parser = configure_argument_parser(MODE_TO_FUNCTION.keys())
     args = arg_parser.parse_args()
+    configure_logging(args)
+    logging.info('Парсер запущен!')
     logging.info(f'Аргументы командной строки: {args}')
     try:
-        session = requests_cache.CachedSession()
-        if args.clear_cache:
-            session.cache.clear()
-        parser_mode = args.mode
-        results = MODE_TO_FUNCTION[parser_mode](session)
-        if results is not None:
-            control_output(results, args)
+        session = configure_session(args)
+        configure_extract_cache(args.memory_cache)
+        runs = list(mode_runs(args))
+        if args.watch or args.cron:
+            from watch import watch
+
+            watch(runs, session, args)
+        else:
+            from cache_store import trim_session_cache
+
+            run_modes(runs, session)
+            trim_session_cache(session, args)
     except Exception as error:
         error_msg = PARSER_ERROR.format(error=error)
         logging.error(error_msg, exc_info=True)
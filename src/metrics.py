@@ -0,0 +1,119 @@
+import datetime as dt
+import json
+import logging
+import time
+from contextlib import contextmanager
+from threading import Lock
+
+from constants import BASE_DIR, DATETIME_FORMAT, METRICS_DIR
+
+COUNTERS = ('calls', 'seconds', 'bytes', 'cache_hits', 'cache_misses')
+PROMETHEUS_PREFIX = 'bs4_parser_stage'
+SUMMARY_FORMAT = (
+    '{stage}: вызовов {calls}, {seconds:.3f} с, {bytes} байт, '
+    'кеш {cache_hits}/{cache_misses} (попадания/промахи)'
+)
+STATS = {}
+STATS_LOCK = Lock()
+
+
+def record(stage, **counters):
+    with STATS_LOCK:
+        stage_stats = STATS.setdefault(stage, dict.fromkeys(COUNTERS, 0))
+        for name, value in counters.items():
+            stage_stats[name] += value
+
+
+@contextmanager
+def measure(stage):
+    """Замеряет время выполнения блока и записывает его в счётчики этапа."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, calls=1, seconds=time.perf_counter() - start)
+
+
+def measure_consumer(stage, rows):
+    """Пропускает строки дальше, записывая в этап время их обработки.
+
+    Время ожидания очередной строки от генератора режима не учитывается:
+    его уже записали этапы загрузки и разбора.
+    """
+    rows = iter(rows)
+    start = time.perf_counter()
+    waiting = 0
+    try:
+        while True:
+            wait_start = time.perf_counter()
+            row = next(rows, None)
+            waiting += time.perf_counter() - wait_start
+            if row is None:
+                return
+            yield row
+    finally:
+        elapsed = time.perf_counter() - start - waiting
+        record(stage, calls=1, seconds=elapsed)
+
+
+def record_response(stage, response):
+    from_cache = getattr(response, 'from_cache', False)
+    record(
+        stage,
+        bytes=len(response.content),
+        cache_hits=int(from_cache),
+        cache_misses=int(not from_cache),
+    )
+
+
+def reset():
+    with STATS_LOCK:
+        STATS.clear()
+
+
+def log_summary():
+    with STATS_LOCK:
+        for stage, stage_stats in STATS.items():
+            logging.info(SUMMARY_FORMAT.format(stage=stage, **stage_stats))
+
+
+def to_json():
+    with STATS_LOCK:
+        return json.dumps(STATS, indent=4, ensure_ascii=False)
+
+
+def to_prometheus():
+    lines = []
+    with STATS_LOCK:
+        for counter in COUNTERS:
+            metric = f'{PROMETHEUS_PREFIX}_{counter}_total'
+            lines.append(f'# TYPE {metric} counter')
+            lines.extend(
+                f'{metric}{{stage="{stage}"}} {stage_stats[counter]}'
+                for stage, stage_stats in STATS.items()
+            )
+    return '\n'.join(lines) + '\n'
+
+
+EXPORTERS = {
+    'json': (to_json, 'json'),
+    'prometheus': (to_prometheus, 'prom'),
+}
+
+
+def export_metrics(cli_args):
+    exporter, extension = EXPORTERS[cli_args.metrics]
+    metrics_dir = BASE_DIR / METRICS_DIR
+    metrics_dir.mkdir(exist_ok=True)
+    now_formatted = dt.datetime.now().strftime(DATETIME_FORMAT)
+    file_path = metrics_dir / f'{cli_args.mode}_{now_formatted}.{extension}'
+    file_path.write_text(exporter(), encoding='utf-8')
+    logging.info(f'Метрики сохранены: {file_path}')
+
+
+def report(cli_args):
+    """Выводит сводку запуска, при необходимости сохраняет её и обнуляет."""
+    log_summary()
+    if getattr(cli_args, 'metrics', None):
+        export_metrics(cli_args)
+    reset()
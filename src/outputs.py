@@ -1,41 +1,245 @@
 import csv
 import datetime as dt
+import gzip
+import io
+import json
+import logging
+import sqlite3
+from itertools import chain, islice
 
-from constants import BASE_DIR, DATETIME_FORMAT
-from prettytable import PrettyTable
+from constants import BASE_DIR, DATETIME_FORMAT, OUTPUT_BATCH_SIZE
+from diffs import CHANGE_COLUMN, diff_rows
+from exceptions import MissingDependencyException
+from metrics import measure_consumer
+from tables import StreamingTable
+
+MISSING_DEPENDENCY = (
+    'Для вывода в формате {output} установите пакет {package}'
+)
+LATEST_RESULT = '{mode}_latest.csv'
+DELTA_EXTENSION = 'delta.csv'
+NO_CHANGES = 'Изменений с прошлого запуска нет'
+FILE_WRITERS = {}
 
 
 def control_output(results, cli_args):
+    results = iter(results)
+    header = next(results, None)
+    if header is None:
+        return
+    results = measure_consumer('output', chain((header,), results))
     output = cli_args.output
     if output == 'pretty':
         pretty_output(results)
-    elif output == 'file':
-        file_output(results, cli_args)
+    elif output in FILE_WRITERS:
+        FILE_WRITERS[output](results, cli_args)
     else:
         default_output(results)
 
 
-def default_output(results):
-    for row in results:
-        print(*row)
+def file_writer(output):
+    """Регистрирует функцию вывода результатов в файл формата `output`."""
+    def register(writer):
+        FILE_WRITERS[output] = writer
+        return writer
+    return register
 
 
-def pretty_output(results):
-    table = PrettyTable()
-    table.field_names = results[0]
-    table.align = 'l'
-    table.add_rows(results[1:])
-    print(table)
+def batched(rows, size=OUTPUT_BATCH_SIZE):
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
 
 
-def file_output(results, cli_args):
+def results_path(cli_args, extension):
     results_dir = BASE_DIR / 'results'
     results_dir.mkdir(exist_ok=True)
     parser_mode = cli_args.mode
     now = dt.datetime.now()
     now_formatted = now.strftime(DATETIME_FORMAT)
-    file_name = f'{parser_mode}_{now_formatted}.csv'
-    file_path = results_dir / file_name
+    return results_dir / f'{parser_mode}_{now_formatted}.{extension}'
+
+
+def previous_result(cli_args):
+    """Последний полный результат режима в CSV или None."""
+    results_dir = BASE_DIR / 'results'
+    latest_path = results_dir / LATEST_RESULT.format(mode=cli_args.mode)
+    if latest_path.exists():
+        return latest_path
+    return max((
+        path for path in results_dir.glob(f'{cli_args.mode}_*.csv')
+        if not path.name.endswith(DELTA_EXTENSION)
+    ), default=None)
+
+
+def read_csv_rows(file_path):
+    if file_path is None:
+        return
+    with open(file_path, encoding='utf-8', newline='') as f:
+        rows = csv.reader(f, dialect='unix')
+        next(rows, None)
+        yield from rows
+
+
+def write_through(writer, rows):
+    for row in rows:
+        writer.writerow(row)
+        yield row
+
+
+def default_output(results):
+    for row in results:
+        print(*row, flush=True)
+
+
+def pretty_output(results):
+    results = iter(results)
+    table = StreamingTable(next(results))
+    for line in table.render(results):
+        print(line, flush=True)
+
+
+def write_csv(text_file, results):
+    writer = csv.writer(text_file, dialect='unix')
+    for batch in batched(results):
+        writer.writerows(batch)
+
+
+@file_writer('file')
+def file_output(results, cli_args):
+    file_path = results_path(cli_args, 'csv')
+    with open(file_path, 'w', encoding='utf-8') as f:
+        write_csv(f, results)
+
+
+@file_writer('csv-gzip')
+def gzip_output(results, cli_args):
+    file_path = results_path(cli_args, 'csv.gz')
+    with gzip.open(file_path, 'wt', encoding='utf-8', newline='') as f:
+        write_csv(f, results)
+
+
+@file_writer('csv-zstd')
+def zstd_output(results, cli_args):
+    try:
+        import zstandard
+    except ImportError:
+        raise MissingDependencyException(MISSING_DEPENDENCY.format(
+            output=cli_args.output, package='zstandard'
+        ))
+    file_path = results_path(cli_args, 'csv.zst')
+    compressor = zstandard.ZstdCompressor()
+    with open(file_path, 'wb') as raw, compressor.stream_writer(raw) as zst:
+        with io.TextIOWrapper(zst, encoding='utf-8', newline='') as f:
+            write_csv(f, results)
+
+
+@file_writer('jsonl')
+def jsonl_output(results, cli_args):
+    results = iter(results)
+    header = next(results)
+    file_path = results_path(cli_args, 'jsonl')
     with open(file_path, 'w', encoding='utf-8') as f:
-        writer = csv.writer(f, dialect='unix')
-        writer.writerows(results)
+        for batch in batched(results):
+            f.writelines(
+                json.dumps(dict(zip(header, row)), ensure_ascii=False) + '\n'
+                for row in batch
+            )
+
+
+@file_writer('sqlite')
+def sqlite_output(results, cli_args):
+    results = iter(results)
+    header = next(results)
+    table = cli_args.mode.replace('-', '_')
+    columns = ', '.join(f'"{column}"' for column in header)
+    placeholders = ', '.join('?' for _ in header)
+    file_path = results_path(cli_args, 'sqlite3')
+    connection = sqlite3.connect(file_path)
+    with connection:
+        connection.execute(f'CREATE TABLE "{table}" ({columns})')
+        for batch in batched(results):
+            connection.executemany(
+                f'INSERT INTO "{table}" VALUES ({placeholders})', batch
+            )
+    connection.close()
+
+
+def import_pyarrow(output):
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise MissingDependencyException(MISSING_DEPENDENCY.format(
+            output=output, package='pyarrow'
+        ))
+    return pyarrow
+
+
+def write_arrow_batches(pyarrow, results, file_path, open_writer):
+    """Пишет строки пачками, определяя схему таблицы по первой пачке."""
+    results = iter(results)
+    header = next(results)
+    writer = None
+    for batch in batched(results):
+        records = [dict(zip(header, row)) for row in batch]
+        if writer is None:
+            schema = pyarrow.Table.from_pylist(records).schema
+            writer = open_writer(str(file_path), schema)
+        writer.write_table(pyarrow.Table.from_pylist(records, schema=schema))
+    if writer is None:
+        schema = pyarrow.schema(
+            [(column, pyarrow.string()) for column in header]
+        )
+        writer = open_writer(str(file_path), schema)
+    writer.close()
+
+
+@file_writer('arrow')
+def arrow_output(results, cli_args):
+    pyarrow = import_pyarrow(cli_args.output)
+    file_path = results_path(cli_args, 'arrow')
+    write_arrow_batches(pyarrow, results, file_path, pyarrow.ipc.new_file)
+
+
+@file_writer('parquet')
+def parquet_output(results, cli_args):
+    pyarrow = import_pyarrow(cli_args.output)
+    file_path = results_path(cli_args, 'parquet')
+    write_arrow_batches(
+        pyarrow, results, file_path, pyarrow.parquet.ParquetWriter
+    )
+
+
+@file_writer('delta')
+def delta_output(results, cli_args):
+    """Сохраняет только отличия от прошлого запуска режима.
+
+    Прошлый результат читается потоком, а полный текущий результат
+    записывается в `<режим>_latest.csv` для сравнения в следующий раз.
+    """
+    results = iter(results)
+    header = next(results)
+    previous_path = previous_result(cli_args)
+    results_dir = BASE_DIR / 'results'
+    results_dir.mkdir(exist_ok=True)
+    latest_path = results_dir / LATEST_RESULT.format(mode=cli_args.mode)
+    temp_path = latest_path.with_suffix('.tmp')
+    with open(temp_path, 'w', encoding='utf-8', newline='') as latest:
+        writer = csv.writer(latest, dialect='unix')
+        writer.writerow(header)
+        changes = diff_rows(
+            lambda: read_csv_rows(previous_path),
+            write_through(writer, results)
+        )
+        first_change = next(changes, None)
+        if first_change is None:
+            logging.info(NO_CHANGES)
+        else:
+            file_path = results_path(cli_args, DELTA_EXTENSION)
+            with open(file_path, 'w', encoding='utf-8') as f:
+                write_csv(f, chain(
+                    ((CHANGE_COLUMN, *header), first_change), changes
+                ))
+    temp_path.replace(latest_path)
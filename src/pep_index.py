@@ -0,0 +1,52 @@
+import datetime as dt
+import hashlib
+import sqlite3
+
+CREATE_TABLE = (
+    'CREATE TABLE IF NOT EXISTS peps ('
+    'url TEXT PRIMARY KEY, '
+    'content_hash TEXT NOT NULL, '
+    'status TEXT, '
+    'checked_at TEXT NOT NULL)'
+)
+SELECT_PEP = 'SELECT content_hash, status FROM peps WHERE url = ?'
+UPSERT_PEP = (
+    'INSERT INTO peps (url, content_hash, status, checked_at) '
+    'VALUES (?, ?, ?, ?) '
+    'ON CONFLICT (url) DO UPDATE SET '
+    'content_hash = excluded.content_hash, '
+    'status = excluded.status, '
+    'checked_at = excluded.checked_at'
+)
+COUNT_STATUSES = (
+    'SELECT status, COUNT(*) FROM peps '
+    'WHERE checked_at >= ? AND status IS NOT NULL '
+    'GROUP BY status ORDER BY MIN(rowid)'
+)
+
+
+def utc_now():
+    return dt.datetime.now(dt.timezone.utc).isoformat()
+
+
+def open_index(path):
+    connection = sqlite3.connect(path)
+    connection.execute(CREATE_TABLE)
+    return connection
+
+
+def get_status(connection, url, response, parse):
+    """Возвращает статус PEP, разбирая карточку только при её изменении."""
+    content_hash = hashlib.sha256(response.content).hexdigest()
+    row = connection.execute(SELECT_PEP, (url,)).fetchone()
+    if row is not None and row[0] == content_hash:
+        status = row[1]
+    else:
+        status = parse(response.text)
+    connection.execute(UPSERT_PEP, (url, content_hash, status, utc_now()))
+    return status
+
+
+def status_counts(connection, since):
+    """Считает статусы PEP, проверенных начиная с момента `since`."""
+    return connection.execute(COUNT_STATUSES, (since,)).fetchall()
@@ -0,0 +1,135 @@
+import re
+from datetime import datetime
+
+TITLE_PATTERN = re.compile(r'PEP\s+(?P<number>\d+)\s*[–—-]\s*(?P<title>.*)')
+NUMBER_PATTERN = re.compile(r'\d+')
+EMAIL_PATTERN = re.compile(r'\s*<[^<>]*>')
+CREATED_FORMAT = '%d-%b-%Y'
+FIELD_TO_ATTRIBUTE = {
+    'Author': 'authors',
+    'Sponsor': 'sponsor',
+    'PEP-Delegate': 'delegate',
+    'Discussions-To': 'discussions_to',
+    'Status': 'status',
+    'Type': 'type',
+    'Topic': 'topic',
+    'Requires': 'requires',
+    'Created': 'created',
+    'Python-Version': 'python_version',
+    'Post-History': 'post_history',
+    'Replaces': 'replaces',
+    'Superseded-By': 'superseded_by',
+    'Resolution': 'resolution',
+}
+UNKNOWN_FIELD = 'Неизвестное поле карточки PEP: {field}'
+
+
+def parse_created(value):
+    try:
+        return datetime.strptime(value, CREATED_FORMAT).date()
+    except ValueError:
+        return None
+
+
+def parse_list(value):
+    return tuple(item.strip() for item in value.split(',') if item.strip())
+
+
+def strip_emails(value):
+    """Имена без адресов вида `<guido at python.org>`."""
+    return EMAIL_PATTERN.sub('', value).strip()
+
+
+def parse_names(value):
+    return parse_list(strip_emails(value))
+
+
+def parse_numbers(value):
+    return tuple(int(number) for number in NUMBER_PATTERN.findall(value))
+
+
+CONVERTERS = {
+    'authors': parse_names,
+    'sponsor': strip_emails,
+    'delegate': strip_emails,
+    'created': parse_created,
+    'post_history': parse_list,
+    'requires': parse_numbers,
+    'replaces': parse_numbers,
+    'superseded_by': parse_numbers,
+}
+DEFAULTS = dict.fromkeys(CONVERTERS, ())
+DEFAULTS.update(created=None, sponsor=None, delegate=None)
+
+
+def join(values):
+    return ', '.join(map(str, values))
+
+
+class PepRecord:
+    """Метаданные одного PEP из полей его карточки.
+
+    Поля, для которых нет атрибута, сохраняются в `extra` парами
+    «поле, значение» в порядке карточки.
+    """
+
+    __slots__ = (
+        'number', 'title', 'status', 'type', 'created', 'python_version',
+        'authors', 'requires', 'discussions_to', 'topic', 'sponsor',
+        'delegate', 'post_history', 'resolution', 'replaces',
+        'superseded_by', 'extra',
+    )
+
+    def __init__(self, number, title, extra=(), **fields):
+        self.number = number
+        self.title = title
+        self.extra = extra
+        for attribute in self.__slots__[2:-1]:
+            setattr(
+                self, attribute, fields.pop(attribute, DEFAULTS.get(attribute))
+            )
+        if fields:
+            raise TypeError(UNKNOWN_FIELD.format(field=', '.join(fields)))
+
+    @classmethod
+    def from_card(cls, heading, fields):
+        """Собирает запись из заголовка карточки и пар «поле: значение»."""
+        title_match = TITLE_PATTERN.search(heading)
+        if title_match is None:
+            return None
+        attributes = {}
+        extra = []
+        for field, value in fields:
+            attribute = FIELD_TO_ATTRIBUTE.get(field)
+            if attribute is None:
+                extra.append((field, value.strip()))
+                continue
+            converter = CONVERTERS.get(attribute, str.strip)
+            attributes[attribute] = converter(value.strip())
+        return cls(
+            int(title_match.group('number')),
+            title_match.group('title').strip(),
+            extra=tuple(extra),
+            **attributes
+        )
+
+    def as_row(self):
+        return (
+            self.number,
+            self.title,
+            self.status or '',
+            self.type or '',
+            self.created.isoformat() if self.created else '',
+            self.python_version or '',
+            join(self.authors),
+            join(self.requires),
+            self.discussions_to or '',
+            self.topic or '',
+            self.sponsor or '',
+            self.delegate or '',
+            join(self.post_history),
+            self.resolution or '',
+            join(self.replaces),
+            join(self.superseded_by),
+            '; '.join(f'{field}: {value}' for field, value in self.extra),
+        )
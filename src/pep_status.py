@@ -0,0 +1,34 @@
+import re
+
+from constants import EXPECTED_STATUS, PEP_STATUS_PATTERN
+from utils import find_tag, get_soup
+
+STATUS_PATTERN = re.compile(PEP_STATUS_PATTERN)
+NO_STATUSES = frozenset()
+ALLOWED_STATUSES = {
+    abbreviation: frozenset(statuses)
+    for abbreviation, statuses in EXPECTED_STATUS.items()
+}
+
+
+def preview_status(row):
+    """Сокращение статуса из первой колонки строки общего списка PEP.
+
+    Первая буква колонки обозначает тип PEP, остальные — его статус.
+    """
+    return find_tag(row, 'td').text[1:]
+
+
+def parse_status(text):
+    soup = get_soup(text, 'pep-card')
+    table = find_tag(soup, 'dl', {'class': 'field-list'})
+    status_match = STATUS_PATTERN.search(table.text)
+    return status_match.group('status') if status_match else None
+
+
+def is_expected(abbreviation, status):
+    return status in ALLOWED_STATUSES.get(abbreviation, NO_STATUSES)
+
+
+def expected_statuses(abbreviation):
+    return ', '.join(sorted(ALLOWED_STATUSES.get(abbreviation, NO_STATUSES)))
@@ -0,0 +1,66 @@
+import json
+import zlib
+from collections import defaultdict
+
+from exceptions import ShardMergeException
+
+SHARD_FILE = 'pep_{index}-of-{count}.json'
+SHARD_GLOB = 'pep_*-of-*.json'
+NO_SHARDS = 'В {directory} нет результатов шардов'
+MIXED_SHARDS = (
+    'В {directory} лежат шарды разных разбиений ({counts}), '
+    'удалите результаты прошлых запусков'
+)
+MISSING_SHARDS = 'Не хватает результатов шардов {missing} из {count}'
+
+
+def in_shard(link, shard):
+    """Делит ссылки между шардами по хешу, одинаковому на любой машине."""
+    index, count = shard
+    return zlib.crc32(link.encode()) % count == index - 1
+
+
+def save_shard(directory, shard, status_sum, mismatches):
+    index, count = shard
+    directory.mkdir(exist_ok=True)
+    file_path = directory / SHARD_FILE.format(index=index, count=count)
+    file_path.write_text(json.dumps({
+        'shard': shard,
+        'counts': list(status_sum.items()),
+        'mismatches': mismatches,
+    }, ensure_ascii=False), encoding='utf-8')
+    return file_path
+
+
+def load_shards(directory):
+    shards = {}
+    for file_path in directory.glob(SHARD_GLOB):
+        data = json.loads(file_path.read_text(encoding='utf-8'))
+        shards[tuple(data['shard'])] = data
+    counts = {count for _, count in shards}
+    if not counts:
+        raise ShardMergeException(NO_SHARDS.format(directory=directory))
+    if len(counts) > 1:
+        raise ShardMergeException(MIXED_SHARDS.format(
+            directory=directory, counts=', '.join(map(str, sorted(counts)))
+        ))
+    count = counts.pop()
+    missing = [
+        index for index in range(1, count + 1) if (index, count) not in shards
+    ]
+    if missing:
+        raise ShardMergeException(MISSING_SHARDS.format(
+            missing=', '.join(map(str, missing)), count=count
+        ))
+    return [shards[key] for key in sorted(shards)]
+
+
+def merge_shards(directory):
+    """Складывает количество статусов и несовпадения всех шардов."""
+    status_sum = defaultdict(int)
+    mismatches = []
+    for shard in load_shards(directory):
+        for status, number in shard['counts']:
+            status_sum[status] += number
+        mismatches.extend(map(tuple, shard['mismatches']))
+    return dict(status_sum), mismatches
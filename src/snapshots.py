@@ -0,0 +1,137 @@
+import io
+import json
+import sqlite3
+import zlib
+from threading import Lock
+
+from constants import DOWNLOAD_CHUNK_SIZE
+from exceptions import SnapshotMissException
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+CREATE_TABLE = (
+    'CREATE TABLE IF NOT EXISTS pages ('
+    'url TEXT PRIMARY KEY, '
+    'status_code INTEGER NOT NULL, '
+    'headers TEXT NOT NULL, '
+    'body BLOB NOT NULL)'
+)
+CREATE_FILE_CHUNKS_TABLE = (
+    'CREATE TABLE IF NOT EXISTS file_chunks ('
+    'url TEXT NOT NULL, '
+    'position INTEGER NOT NULL, '
+    'data BLOB NOT NULL, '
+    'PRIMARY KEY (url, position))'
+)
+INSERT_PAGE = 'INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?)'
+SELECT_PAGE = 'SELECT status_code, headers, body FROM pages WHERE url = ?'
+DELETE_FILE = 'DELETE FROM file_chunks WHERE url = ?'
+INSERT_FILE_CHUNK = 'INSERT INTO file_chunks VALUES (?, ?, ?)'
+SELECT_FILE = 'SELECT data FROM file_chunks WHERE url = ? ORDER BY position'
+SKIPPED_HEADERS = frozenset(
+    {'content-encoding', 'content-length', 'transfer-encoding'}
+)
+COMPRESSION_LEVEL = 9
+
+
+class SnapshotArchive:
+    """Сжатый архив загруженных страниц в одном файле SQLite.
+
+    Скачанные файлы хранятся без сжатия частями по DOWNLOAD_CHUNK_SIZE:
+    архивы документации уже сжаты, а запись по частям не читает файл
+    в память целиком.
+    """
+
+    def __init__(self, path):
+        self.lock = Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.execute(CREATE_TABLE)
+            self.connection.execute(CREATE_FILE_CHUNKS_TABLE)
+
+    def save(self, url, status_code, headers, body):
+        headers = {
+            name: value for name, value in headers.items()
+            if name.lower() not in SKIPPED_HEADERS
+        }
+        with self.lock, self.connection:
+            self.connection.execute(INSERT_PAGE, (
+                url,
+                status_code,
+                json.dumps(headers),
+                zlib.compress(body, COMPRESSION_LEVEL),
+            ))
+
+    def save_file(self, url, path, chunk_size=DOWNLOAD_CHUNK_SIZE):
+        with self.lock, self.connection, open(path, 'rb') as file:
+            self.connection.execute(DELETE_FILE, (url,))
+            position = 0
+            while chunk := file.read(chunk_size):
+                self.connection.execute(
+                    INSERT_FILE_CHUNK, (url, position, chunk)
+                )
+                position += 1
+
+    def load_file(self, url):
+        with self.lock:
+            chunks = self.connection.execute(SELECT_FILE, (url,)).fetchall()
+        if not chunks:
+            return None
+        return 200, {}, b''.join(chunk for chunk, in chunks)
+
+    def load(self, url):
+        with self.lock:
+            row = self.connection.execute(SELECT_PAGE, (url,)).fetchone()
+        if row is None:
+            return self.load_file(url)
+        status_code, headers, body = row
+        return status_code, json.loads(headers), zlib.decompress(body)
+
+
+class ReplayAdapter(HTTPAdapter):
+    """Отдаёт ответы из архива вместо обращения к сети."""
+
+    def __init__(self, archive):
+        super().__init__()
+        self.archive = archive
+
+    def send(self, request, **kwargs):
+        page = self.archive.load(request.url)
+        if page is None:
+            raise SnapshotMissException(
+                f'Страницы {request.url} нет в архиве', request=request
+            )
+        status_code, headers, body = page
+        return self.build_response(request, HTTPResponse(
+            body=io.BytesIO(body),
+            headers=headers,
+            status=status_code,
+            preload_content=False,
+            request_url=request.url,
+        ))
+
+
+RECORDER = None
+
+
+def start_recording(path):
+    global RECORDER
+    RECORDER = SnapshotArchive(path)
+
+
+def save_page(url, response):
+    if RECORDER is not None:
+        RECORDER.save(
+            url, response.status_code, response.headers, response.content
+        )
+
+
+def save_file(url, path):
+    if RECORDER is not None:
+        RECORDER.save_file(url, path)
+
+
+def mount_replay(session, path):
+    adapter = ReplayAdapter(SnapshotArchive(path))
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
@@ -0,0 +1,59 @@
+import textwrap
+from itertools import chain, islice, zip_longest
+
+from constants import PRETTY_MAX_WIDTH, PRETTY_SAMPLE_ROWS
+
+
+class StreamingTable:
+    """Таблица для консоли, которая выводит строки по мере поступления.
+
+    Ширина столбцов задаётся явно или определяется по первым
+    `sample_size` строкам; более длинные значения переносятся
+    внутри ячейки, поэтому память не зависит от числа строк.
+    """
+
+    def __init__(self, header, widths=None, max_width=PRETTY_MAX_WIDTH,
+                 sample_size=PRETTY_SAMPLE_ROWS):
+        self.header = [str(column) for column in header]
+        self.widths = widths
+        self.max_width = max_width
+        self.sample_size = sample_size
+
+    def fit_widths(self, sample):
+        widths = [len(column) for column in self.header]
+        for row in sample:
+            for index, cell in enumerate(row):
+                widths[index] = max(widths[index], len(str(cell)))
+        return [min(width, self.max_width) for width in widths]
+
+    def border(self):
+        return '+' + '+'.join('-' * (width + 2) for width in self.widths) + '+'
+
+    def format_row(self, row):
+        cells = []
+        for cell, width in zip(row, self.widths):
+            cell = str(cell)
+            if len(cell) <= width and '\n' not in cell:
+                cells.append((cell,))
+            else:
+                cells.append(textwrap.wrap(cell, width) or ('',))
+        return '\n'.join(
+            '| ' + ' | '.join(
+                part.ljust(width) for part, width in zip(parts, self.widths)
+            ) + ' |'
+            for parts in zip_longest(*cells, fillvalue='')
+        )
+
+    def render(self, rows):
+        rows = iter(rows)
+        sample = ()
+        if self.widths is None:
+            sample = list(islice(rows, self.sample_size))
+            self.widths = self.fit_widths(sample)
+        border = self.border()
+        yield border
+        yield self.format_row(self.header)
+        yield border
+        for row in chain(sample, rows):
+            yield self.format_row(row)
+        yield border
@@ -0,0 +1,160 @@
+import logging
+import random
+import time
+from threading import Lock
+from urllib.parse import urlparse
+
+from constants import (BACKOFF_BASE, BACKOFF_CAP, CIRCUIT_BREAKER_COOLDOWN,
+                       CIRCUIT_BREAKER_THRESHOLD, CONNECT_TIMEOUT, MAX_RETRIES,
+                       POOL_CONNECTIONS, READ_TIMEOUT)
+from exceptions import CircuitBreakerOpenException
+from requests import ConnectionError, HTTPError, Timeout
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRY_LOG = 'Повторный запрос {url} через {delay:.2f} с: {error}'
+
+
+class HostRateLimiter:
+    """Равномерно распределяет запросы к каждому хосту во времени."""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate else 0
+        self.lock = Lock()
+        self.next_slot = {}
+
+    def wait(self, host):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, now))
+            self.next_slot[host] = slot + self.interval
+        time.sleep(slot - now)
+
+
+class CircuitBreaker:
+    """Перестаёт обращаться к хосту после серии неудачных запросов."""
+
+    def __init__(self, threshold, cooldown):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.lock = Lock()
+        self.failures = {}
+        self.opened_until = {}
+
+    def allow(self, host):
+        return time.monotonic() >= self.opened_until.get(host, 0)
+
+    def success(self, host):
+        with self.lock:
+            self.failures[host] = 0
+
+    def failure(self, host):
+        with self.lock:
+            self.failures[host] = self.failures.get(host, 0) + 1
+            if self.failures[host] >= self.threshold:
+                self.opened_until[host] = time.monotonic() + self.cooldown
+                self.failures[host] = 0
+                logging.warning(
+                    f'Запросы к {host} приостановлены на {self.cooldown} с'
+                )
+
+
+class Transport:
+    def __init__(
+        self,
+        timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+        retries=MAX_RETRIES,
+        rate_limit=0,
+    ):
+        self.timeout = timeout
+        self.retries = retries
+        self.limiter = HostRateLimiter(rate_limit)
+        self.breaker = CircuitBreaker(
+            CIRCUIT_BREAKER_THRESHOLD, CIRCUIT_BREAKER_COOLDOWN
+        )
+
+
+TRANSPORT = Transport()
+
+
+class ThrottledAdapter(HTTPAdapter):
+    """Ограничивает частоту запросов к хосту и соблюдает предохранитель.
+
+    Кеширующая сессия обращается к адаптеру только при промахе кеша
+    или перепроверке, поэтому ответы из кеша отдаются без ожидания.
+    """
+
+    def send(self, request, *args, **kwargs):
+        transport = TRANSPORT
+        host = urlparse(request.url).netloc
+        if not transport.breaker.allow(host):
+            raise CircuitBreakerOpenException(
+                f'Запросы к {host} приостановлены', request=request
+            )
+        transport.limiter.wait(host)
+        return super().send(request, *args, **kwargs)
+
+
+def backoff_delays(retries, base=BACKOFF_BASE, cap=BACKOFF_CAP):
+    """Экспоненциальные задержки с полным джиттером."""
+    for attempt in range(retries):
+        yield random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def retry_after(response):
+    value = response.headers.get('Retry-After', '')
+    return float(value) if value.isdigit() else 0
+
+
+def send(session, url, **kwargs):
+    """Выполняет GET-запрос с таймаутами и повторами.
+
+    Ответы со статусами из RETRY_STATUSES и сетевые ошибки повторяются
+    с экспоненциальной задержкой; после исчерпания попыток исключение
+    пробрасывается вызывающему коду.
+    """
+    transport = TRANSPORT
+    host = urlparse(url).netloc
+    delays = backoff_delays(transport.retries)
+    while True:
+        try:
+            response = session.get(url, timeout=transport.timeout, **kwargs)
+            if response.status_code not in RETRY_STATUSES:
+                transport.breaker.success(host)
+                return response
+            # Иначе при stream=True соединение не вернётся в пул, и после
+            # `workers` повторов запросы к хосту заблокируются навсегда.
+            response.close()
+            raise HTTPError(
+                f'{response.status_code} для {url}', response=response
+            )
+        except (ConnectionError, HTTPError, Timeout) as error:
+            delay = next(delays, None)
+            if delay is None:
+                transport.breaker.failure(host)
+                raise
+            if error.response is not None:
+                delay = max(delay, retry_after(error.response))
+            logging.warning(
+                RETRY_LOG.format(url=url, delay=delay, error=error)
+            )
+            time.sleep(delay)
+
+
+def configure_transport(session, cli_args):
+    """Настраивает пулы соединений сессии и параметры запросов."""
+    global TRANSPORT
+    TRANSPORT = Transport(
+        timeout=(CONNECT_TIMEOUT, cli_args.timeout),
+        retries=cli_args.retries,
+        rate_limit=cli_args.rate_limit,
+    )
+    adapter = ThrottledAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=cli_args.workers,
+        pool_block=True,
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
@@ -1,24 +1,118 @@
 import logging
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from threading import BoundedSemaphore
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup, SoupStrainer
+from constants import MAX_WORKERS, PARSE_PROCESSES, PER_HOST_LIMIT
 from exceptions import ParserFindTagException
+from extract_cache import cached_parse, submit_cached_parse
+from frontier import fetch_once
+from log_handlers import worker_logging
+from metrics import measure, record, record_response
 from requests import RequestException
+from snapshots import save_page
+from transport import send
+
+
+def has_class(name):
+    return re.compile(rf'(?<!\S){name}(?!\S)')
+
+
+PARSE_TARGETS = {
+    'whats-new-index': SoupStrainer('section', id='what-s-new-in-python'),
+    'whats-new-page': SoupStrainer(['h1', 'dl']),
+    'latest-versions': SoupStrainer(
+        'div', class_=has_class('sphinxsidebarwrapper')
+    ),
+    'download': SoupStrainer('table', class_=has_class('docutils')),
+    'pep-index': SoupStrainer('section', id='numerical-index'),
+    'pep-card': SoupStrainer('dl', class_=has_class('field-list')),
+    'pep-metadata': SoupStrainer(['h1', 'dl']),
+}
 
 
 def get_response(session, url):
+    """Загружает страницу.
+
+    Внутри `shared_pages` одновременные запросы одного адреса
+    выполняются один раз.
+    """
+    return fetch_once(url, lambda url: load_response(session, url))
+
+
+def load_response(session, url):
     try:
-        response = session.get(url)
+        with measure('fetch'):
+            response = send(session, url)
         response.encoding = 'utf-8'
+        record_response('fetch', response)
+        save_page(url, response)
         return response
     except RequestException:
-        logging.exception(
-            f'Возникла ошибка при загрузке страницы {url}',
-            stack_info=True
+        logging.exception(f'Возникла ошибка при загрузке страницы {url}')
+
+
+def fetch_all(session, urls, workers=MAX_WORKERS, per_host=PER_HOST_LIMIT):
+    """Загружает страницы пулом потоков, сохраняя порядок ссылок.
+
+    К одному хосту одновременно идёт не больше `per_host` запросов;
+    при `per_host=0` ограничением служит только число потоков.
+    """
+    urls = list(urls)
+    host_limits = {
+        urlparse(url).netloc: BoundedSemaphore(per_host or workers)
+        for url in urls
+    }
+
+    def fetch(url):
+        with host_limits[urlparse(url).netloc]:
+            return get_response(session, url)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(fetch, urls)
+
+
+def parse_all(parse, responses, processes=PARSE_PROCESSES):
+    """Разбирает страницы по мере загрузки, сохраняя их порядок.
+
+    Если задано количество процессов, разбор выполняется в пуле процессов
+    и идёт параллельно с загрузкой ещё не полученных страниц. Уже
+    разобранные страницы с тем же содержимым берутся из кеша.
+    """
+    if not processes:
+        for response in responses:
+            yield None if response is None else cached_parse(parse, response)
+        return
+    with ProcessPoolExecutor(
+        max_workers=processes, **worker_logging()
+    ) as executor:
+        futures = [
+            None if response is None
+            else submit_cached_parse(executor, parse, response)
+            for response in responses
+        ]
+        for future in futures:
+            yield None if future is None else future.result()
+
+
+def get_soup(text, target=None):
+    """Строит дерево только из поддеревьев, нужных режиму `target`."""
+    record('parse', bytes=len(text))
+    with measure('parse'):
+        return BeautifulSoup(
+            text,
+            features='lxml',
+            parse_only=PARSE_TARGETS[target] if target else None
         )
 
 
 def find_tag(soup, tag, attrs=None):
-    searched_tag = soup.find(tag, attrs=(attrs or {}))
+    with measure('extract'):
+        searched_tag = soup.find(tag, attrs=(attrs or {}))
     if searched_tag is None:
         error_msg = f'Не найден тег {tag} {attrs}'
-        logging.error(error_msg, stack_info=True)
+        logging.error(error_msg)
         raise ParserFindTagException(error_msg)
     return searched_tag
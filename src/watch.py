@@ -0,0 +1,139 @@
+import datetime as dt
+import logging
+import time
+
+from diffs import CHANGE_COLUMN, diff_rows
+from metrics import report
+
+CRON_FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+CRON_ERROR = 'Некорректное cron-выражение: {expression}'
+CRON_SEARCH_LIMIT = dt.timedelta(days=5 * 366)
+WATCH_ERROR = 'Сбой при повторном запуске: {error}'
+NO_CHANGES = 'Изменений с прошлого запуска нет'
+NEXT_RUN = 'Следующий запуск: {run_at:%d.%m.%Y %H:%M:%S}'
+
+
+def parse_cron_field(field, low, high):
+    values = set()
+    for part in field.split(','):
+        spec, _, step = part.partition('/')
+        if spec == '*':
+            start, end = low, high
+        elif '-' in spec:
+            start, end = map(int, spec.split('-'))
+        else:
+            start = int(spec)
+            end = high if step else start
+        values.update(range(start, end + 1, int(step or 1)))
+    if not values or min(values) < low or max(values) > high:
+        raise ValueError
+    return frozenset(values)
+
+
+class CronSchedule:
+    """Расписание в формате cron: минута, час, день, месяц, день недели."""
+
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != len(CRON_FIELDS):
+            raise ValueError(CRON_ERROR.format(expression=expression))
+        try:
+            self.minutes, self.hours, self.days, self.months, weekdays = (
+                parse_cron_field(field, low, high)
+                for field, (low, high) in zip(fields, CRON_FIELDS)
+            )
+        except ValueError:
+            raise ValueError(CRON_ERROR.format(expression=expression))
+        self.weekdays = frozenset(day % 7 for day in weekdays)
+        self.any_day = '*' in (fields[2], fields[4])
+
+    def day_matches(self, moment):
+        """Как и в cron, ограничения дня месяца и недели объединяются."""
+        day = moment.day in self.days
+        weekday = (moment.weekday() + 1) % 7 in self.weekdays
+        return day and weekday if self.any_day else day or weekday
+
+    def next_after(self, moment):
+        moment = moment.replace(second=0, microsecond=0)
+        moment += dt.timedelta(minutes=1)
+        limit = moment + CRON_SEARCH_LIMIT
+        while moment < limit:
+            if moment.month not in self.months:
+                moment = moment.replace(day=1, hour=0, minute=0)
+                moment = (moment + dt.timedelta(days=32)).replace(day=1)
+            elif not self.day_matches(moment):
+                moment = moment.replace(hour=0, minute=0)
+                moment += dt.timedelta(days=1)
+            elif moment.hour not in self.hours:
+                moment = moment.replace(minute=0) + dt.timedelta(hours=1)
+            elif moment.minute not in self.minutes:
+                moment += dt.timedelta(minutes=1)
+            else:
+                return moment
+        raise ValueError('Расписание не срабатывает ни разу')
+
+
+def run_times(cli_args):
+    """Моменты запусков.
+
+    С `--watch` первый запуск выполняется сразу, а следующие через
+    интервал; с `--cron` каждый запуск, включая первый, ждёт ближайшего
+    подходящего под расписание момента.
+    """
+    moment = dt.datetime.now()
+    if cli_args.cron is not None:
+        while True:
+            moment = cli_args.cron.next_after(max(moment, dt.datetime.now()))
+            yield moment
+    interval = dt.timedelta(seconds=cli_args.watch)
+    while True:
+        yield moment
+        moment = max(moment + interval, dt.datetime.now())
+
+
+def watch_run(mode_function, session, cli_args, previous):
+    from outputs import control_output
+
+    results = mode_function(session, cli_args)
+    if results is None:
+        return previous
+    results = iter(results)
+    header = next(results, None)
+    if header is None:
+        return previous
+    rows = list(results)
+    changes = list(diff_rows(lambda: previous, rows))
+    if changes:
+        control_output([(CHANGE_COLUMN, *header), *changes], cli_args)
+    else:
+        logging.info(NO_CHANGES)
+    return rows
+
+
+def watch(runs, session, cli_args, times=None):
+    """Перезапускает режимы по расписанию в одной сессии.
+
+    Сессия с кешем и пулом соединений живёт между запусками, а выводятся
+    только строки, изменившиеся с прошлого запуска режима.
+    """
+    from cache_store import trim_session_cache
+    from frontier import shared_pages
+
+    previous = {}
+    for run_at in run_times(cli_args) if times is None else times:
+        logging.info(NEXT_RUN.format(run_at=run_at))
+        time.sleep(max((run_at - dt.datetime.now()).total_seconds(), 0))
+        with shared_pages():
+            for mode_args, mode_function in runs:
+                mode = mode_args.mode
+                try:
+                    previous[mode] = watch_run(
+                        mode_function, session, mode_args,
+                        previous.get(mode, [])
+                    )
+                except Exception as error:
+                    logging.error(
+                        WATCH_ERROR.format(error=error), exc_info=True
+                    )
+                report(mode_args)
+        trim_session_cache(session, cli_args)
@@ -16,6 +16,22 @@ sys.path.append(str(SRC_DIR))
 
 MAIN_DOC_URL = 'https://docs.python.org/3/'
 PEP_URL = 'https://www.python.org/dev/peps/'
+HTML_DIR = BASE_DIR / 'tests' / 'fixture_data' / 'html'
+OFFLINE_PAGES = {
+    MAIN_DOC_URL: 'docs_index.html',
+    MAIN_DOC_URL + 'whatsnew/': 'whatsnew_index.html',
+    MAIN_DOC_URL + 'whatsnew/3.12.html': 'whatsnew_3.12.html',
+    MAIN_DOC_URL + 'whatsnew/3.11.html': 'whatsnew_3.11.html',
+    MAIN_DOC_URL + 'whatsnew/2.0.html': 'whatsnew_2.0.html',
+    MAIN_DOC_URL + 'download.html': 'download.html',
+    'https://peps.python.org/': 'pep_index.html',
+    'https://peps.python.org/api/peps.json': 'peps.json',
+    **{
+        f'https://peps.python.org/pep-{number}/': f'pep-{number}.html'
+        for number in ('0001', '0008', '0255', '0315', '0401', '0638')
+    },
+}
+OFFLINE_ARCHIVE = b'PK\x03\x04' + bytes(64 * 1024)
 
 
 precode_files = ['constants.py', 'main.py', 'utils.py']
@@ -72,6 +88,38 @@ def mock_session(tempfile_session) -> CachedSession:
     yield mount_mock_adapter(tempfile_session)
 
 
+def get_offline_adapter() -> Adapter:
+    adapter = Adapter()
+    adapter.register_uri(
+        'GET',
+        requests_mock.ANY,
+        content=OFFLINE_ARCHIVE,
+        headers={'Content-Type': 'application/zip'},
+        status_code=200,
+    )
+    for url, file_name in OFFLINE_PAGES.items():
+        adapter.register_uri(
+            'GET',
+            url,
+            content=(HTML_DIR / file_name).read_bytes(),
+            headers={'Content-Type': 'text/html; charset=utf-8'},
+            status_code=200,
+        )
+    return adapter
+
+
+def make_offline_session() -> CachedSession:
+    """Get a CachedSession serving fixture pages instead of the network"""
+    session = CachedSession(backend='memory')
+    session.mount('https://', get_offline_adapter())
+    return session
+
+
+@pytest.fixture(scope='function')
+def offline_session() -> CachedSession:
+    yield make_offline_session()
+
+
 @pytest.fixture
 def response_page(mock_session):
     def _response_page(page):
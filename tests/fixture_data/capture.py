@@ -0,0 +1,37 @@
+"""Записывает карточки PEP и статьи «What's New» для офлайн-тестов.
+
+Запуск из корня проекта: `python tests/fixture_data/capture.py`.
+Страницы-списки (`docs_index.html`, `whatsnew_index.html`,
+`pep_index.html`, `download.html`, `peps.json`) урезаны до записанных
+страниц и правятся вручную. После записи обновите базовые замеры:
+`BENCHMARK_UPDATE=1 pytest -m benchmark`.
+"""
+import sys
+from pathlib import Path
+
+import requests
+
+TESTS_DIR = Path(__file__).resolve().parent.parent
+TRIMMED_PAGES = frozenset({
+    'docs_index.html', 'whatsnew_index.html', 'pep_index.html',
+    'download.html', 'peps.json',
+})
+TIMEOUT = 30
+
+
+def capture():
+    sys.path.append(str(TESTS_DIR))
+    from conftest import HTML_DIR, OFFLINE_PAGES
+
+    session = requests.Session()
+    for url, file_name in OFFLINE_PAGES.items():
+        if file_name in TRIMMED_PAGES:
+            continue
+        response = session.get(url, timeout=TIMEOUT)
+        response.raise_for_status()
+        (HTML_DIR / file_name).write_bytes(response.content)
+        print(f'{url} -> {file_name} ({len(response.content)} байт)')
+
+
+if __name__ == '__main__':
+    capture()
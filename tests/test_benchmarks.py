@@ -0,0 +1,178 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from argparse import Namespace
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+from conftest import HTML_DIR, SRC_DIR, make_offline_session
+try:
+    from src import main, outputs, utils
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файлы парсера'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файлы парсера'
+
+pytestmark = pytest.mark.benchmark
+
+BENCHMARKS_FILE = Path(__file__).parent / 'fixture_data' / 'benchmarks.json'
+THRESHOLD = float(os.getenv('BENCHMARK_THRESHOLD', 3))
+TOLERANCE = 0.005
+UPDATE = os.getenv('BENCHMARK_UPDATE') == '1'
+REPEAT = 5
+OUTPUT_ROWS = 2000
+EXTRACT_CACHE_MEMORY = 32
+
+EXPECTED_ROWS = {
+    'whats-new': 4,
+    'latest-versions': 11,
+    'pep': 7,
+    'pep-metadata': 7,
+    'download': None,
+}
+
+
+@pytest.fixture(scope='module')
+def baselines():
+    data = {}
+    if BENCHMARKS_FILE.exists():
+        data = json.loads(BENCHMARKS_FILE.read_text(encoding='utf-8'))
+    yield data
+    if UPDATE:
+        BENCHMARKS_FILE.write_text(
+            json.dumps(data, indent=4, sort_keys=True) + '\n',
+            encoding='utf-8'
+        )
+
+
+@pytest.fixture
+def measure(baselines):
+    def _measure(name, func, setup=tuple):
+        timings = []
+        for _ in range(REPEAT):
+            args = setup()
+            start = time.perf_counter()
+            result = func(*args)
+            timings.append(time.perf_counter() - start)
+        elapsed = min(timings)
+        if UPDATE:
+            baselines[name] = round(elapsed, 6)
+            return result
+        assert name in baselines, (
+            f'Нет базового замера для `{name}`. '
+            'Запустите тесты с BENCHMARK_UPDATE=1'
+        )
+        assert elapsed <= baselines[name] * THRESHOLD + TOLERANCE, (
+            f'`{name}` замедлился: {elapsed:.4f} с против '
+            f'{baselines[name]:.4f} с в базовом замере'
+        )
+        return result
+    return _measure
+
+
+def run_mode(session, cli_args):
+    results = main.MODE_TO_FUNCTION[cli_args.mode](session, cli_args)
+    return None if results is None else list(results)
+
+
+def fresh_session():
+    """Сессия без закешированных страниц и извлечённых из них данных."""
+    main.configure_extract_cache(EXTRACT_CACHE_MEMORY)
+    return make_offline_session()
+
+
+def run_python(code):
+    return subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def read_page(file_name):
+    return (HTML_DIR / file_name).read_text(encoding='utf-8')
+
+
+@pytest.mark.parametrize('mode', list(EXPECTED_ROWS))
+def test_mode_benchmark(measure, monkeypatch, tmp_path, mode):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    cli_args = Namespace(mode=mode, workers=4)
+    got = measure(
+        f'mode:{mode}',
+        run_mode,
+        setup=lambda: (fresh_session(), cli_args)
+    )
+    if EXPECTED_ROWS[mode] is None:
+        assert got is None
+        assert list(tmp_path.glob('downloads/*.zip')), (
+            'Архив с документацией не сохранён'
+        )
+    else:
+        assert len(got) == EXPECTED_ROWS[mode], (
+            f'Режим `{mode}` вернул неожиданное количество строк'
+        )
+
+
+def test_pep_json_engine_benchmark(measure, monkeypatch, tmp_path):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    cli_args = Namespace(mode='pep', engine='json', workers=4)
+    got = measure(
+        'mode:pep-json',
+        run_mode,
+        setup=lambda: (fresh_session(), cli_args)
+    )
+    assert len(got) == EXPECTED_ROWS['pep'], (
+        'Движок json вернул неожиданное количество строк'
+    )
+
+
+@pytest.mark.parametrize('target, file_name', [
+    ('whats-new-index', 'whatsnew_index.html'),
+    ('whats-new-page', 'whatsnew_3.12.html'),
+    ('latest-versions', 'docs_index.html'),
+    ('download', 'download.html'),
+    ('pep-index', 'pep_index.html'),
+    ('pep-card', 'pep-0255.html'),
+    ('pep-metadata', 'pep-0255.html'),
+])
+def test_parse_benchmark(measure, target, file_name):
+    text = read_page(file_name)
+    soup = measure(f'parse:{target}', utils.get_soup, setup=lambda: (
+        text, target
+    ))
+    assert soup.find(True) is not None, (
+        f'Разбор `{target}` вернул пустое дерево'
+    )
+
+
+def test_find_tag_benchmark(measure):
+    soup = BeautifulSoup(read_page('pep_index.html'), features='lxml')
+    got = measure('find_tag', utils.find_tag, setup=lambda: (
+        soup, 'section', {'id': 'numerical-index'}
+    ))
+    assert got['id'] == 'numerical-index'
+
+
+@pytest.mark.parametrize('output', [None, 'pretty', 'file'])
+def test_output_benchmark(
+        measure, monkeypatch, tmp_path, capsys, records, output
+):
+    monkeypatch.setattr(outputs, 'BASE_DIR', tmp_path)
+    header, *rows = records('whats-new')
+    results = [header, *rows * (OUTPUT_ROWS // len(rows))]
+    cli_args = Namespace(mode='whats-new', output=output)
+    measure(
+        f'output:{output or "default"}',
+        outputs.control_output,
+        setup=lambda: (results, cli_args)
+    )
+    capsys.readouterr()
+
+
+def test_import_benchmark(measure):
+    measure('startup:import', run_python, setup=lambda: ('import main',))
@@ -0,0 +1,67 @@
+from datetime import timedelta
+
+import requests_mock
+from requests_cache import CachedSession
+try:
+    from src import cache_store
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `cache_store.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `cache_store.py`'
+
+PEP_URL = 'https://peps.python.org/pep-0008/'
+INDEX_URL = 'https://peps.python.org/'
+DOCS_URL = 'https://docs.python.org/3/'
+BODY = '<p>Simple Generators</p>' * 2000
+
+
+def make_session(db_path, backend):
+    session = CachedSession(
+        backend=backend,
+        urls_expire_after={
+            'peps.python.org/pep-*': timedelta(days=30),
+            'peps.python.org': timedelta(hours=1),
+            'docs.python.org': timedelta(days=1),
+        },
+    )
+    adapter = requests_mock.Adapter()
+    adapter.register_uri(requests_mock.ANY, requests_mock.ANY, text=BODY)
+    session.mount('https://', adapter)
+    return session
+
+
+def stored_sizes(session):
+    responses = session.cache.responses
+    with responses.connection() as connection:
+        return dict(connection.execute(
+            f'SELECT key, LENGTH(value) FROM {responses.table_name}'
+        ).fetchall())
+
+
+def test_compressed_backend(tmp_path):
+    db_path = tmp_path / 'http_cache'
+    session = make_session(db_path, cache_store.compressed_backend(db_path))
+    session.get(PEP_URL)
+    response = session.get(PEP_URL)
+    assert response.from_cache and response.text == BODY
+    assert max(stored_sizes(session).values()) < len(BODY) // 10, (
+        'Ответы должны храниться в кеше сжатыми'
+    )
+    with session.cache.responses.connection() as connection:
+        journal_mode = connection.execute('PRAGMA journal_mode').fetchone()
+    assert journal_mode[0] == 'wal', 'Кеш должен работать в режиме WAL'
+
+
+def test_trim_cache_evicts_soonest_expiring(tmp_path):
+    db_path = tmp_path / 'http_cache'
+    session = make_session(db_path, cache_store.compressed_backend(db_path))
+    for url in (PEP_URL, INDEX_URL, DOCS_URL):
+        session.get(url)
+    sizes = stored_sizes(session)
+    cache_store.trim_cache(session, max(sizes.values()) + 1)
+    assert session.cache.contains(url=PEP_URL), (
+        'Дольше всего актуальные ответы удаляются из кеша последними'
+    )
+    assert not session.cache.contains(url=INDEX_URL)
+    assert not session.cache.contains(url=DOCS_URL)
+    assert sum(stored_sizes(session).values()) <= max(sizes.values()) + 1
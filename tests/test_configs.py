@@ -1,5 +1,8 @@
 import pytest
 import argparse
+from datetime import timedelta
+
+from requests_cache.policy import get_url_expiration
 try:
     from src import configs
 except ModuleNotFoundError:
@@ -29,7 +32,10 @@ def test_configs_file():
     ),
     (
         argparse._StoreAction, ['-o', '--output'], 'output',
-        ('pretty', 'file'),
+        (
+            'pretty', 'file', 'jsonl', 'csv-gzip', 'csv-zstd', 'sqlite',
+            'arrow', 'parquet', 'delta',
+        ),
         'Дополнительные способы вывода данных'
     ),
 ])
@@ -64,3 +70,109 @@ def test_configure_argument_parser(
     assert got_action.help == help_str, (
         f'Укажите help-строку cli аргумента {got_action.dest}'
     )
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('3/8', (3, 8)),
+    ('1/1', (1, 1)),
+    ('0/8', None),
+    ('9/8', None),
+    ('3', None),
+])
+def test_parse_shard(value, expected):
+    if expected is None:
+        with pytest.raises(argparse.ArgumentTypeError):
+            configs.parse_shard(value)
+    else:
+        assert configs.parse_shard(value) == expected
+
+
+@pytest.mark.parametrize('value', ['0', '-5', 'десять'])
+def test_watch_requires_positive_interval(value):
+    parser = configs.configure_argument_parser(['pep'])
+    with pytest.raises(SystemExit):
+        parser.parse_args(['pep', '--watch', value])
+    assert parser.parse_args(['pep', '--watch', '600']).watch == 600
+
+
+@pytest.mark.parametrize('options', [
+    ['-w', '0'],
+    ['--workers', '-2'],
+    ['--per-host', '-1'],
+    ['-p', '-1'],
+    ['--spot-check', '-3'],
+])
+def test_pool_sizes_are_validated(options):
+    parser = configs.configure_argument_parser(['pep'])
+    with pytest.raises(SystemExit):
+        parser.parse_args(['pep', *options])
+
+
+def test_pool_sizes_allow_zero_where_it_means_default():
+    parser = configs.configure_argument_parser(['pep'])
+    args = parser.parse_args(
+        ['pep', '--per-host', '0', '-p', '0', '--spot-check', '0']
+    )
+    assert (args.per_host, args.processes, args.spot_check) == (0, 0, 0)
+
+
+def test_replay_requires_existing_archive(tmp_path):
+    parser = configs.configure_argument_parser(['pep'])
+    missing = tmp_path / 'missing.sqlite3'
+    with pytest.raises(SystemExit):
+        parser.parse_args(['pep', '--replay', str(missing)])
+    assert not missing.exists(), (
+        'Несуществующий архив не должен создаваться пустым'
+    )
+    missing.touch()
+    assert parser.parse_args(['pep', '--replay', str(missing)]).replay == (
+        missing
+    )
+
+
+@pytest.fixture
+def make_session(monkeypatch, tmp_path):
+    """Сессия из аргументов командной строки с кешем во временной папке.
+
+    configure_session меняет общие настройки транспорта, поэтому после
+    теста они восстанавливаются.
+    """
+    import transport
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(transport, 'TRANSPORT', transport.TRANSPORT)
+    parser = configs.configure_argument_parser(['pep'])
+    return lambda options: configs.configure_session(
+        parser.parse_args(options)
+    )
+
+
+@pytest.mark.parametrize('url, expire_after', [
+    ('https://peps.python.org/pep-0008/', timedelta(days=30)),
+    ('https://peps.python.org/', timedelta(hours=1)),
+    ('https://peps.python.org/api/peps.json', timedelta(hours=1)),
+    ('https://docs.python.org/3/whatsnew/3.12.html', timedelta(days=7)),
+    ('https://docs.python.org/3/whatsnew/', timedelta(days=7)),
+    ('https://docs.python.org/3/download.html', timedelta(hours=1)),
+])
+def test_session_expiration_policy(make_session, url, expire_after):
+    session = make_session(['pep'])
+    got = get_url_expiration(url, session.settings.urls_expire_after)
+    session.close()
+    assert got == expire_after, (
+        f'Для {url} задан неверный срок хранения в кеше: '
+        'первым должен совпадать самый точный шаблон'
+    )
+
+
+@pytest.mark.parametrize('options, always_revalidate', [
+    (['pep'], False),
+    (['pep', '--revalidate'], True),
+])
+def test_session_revalidate(make_session, options, always_revalidate):
+    session = make_session(options)
+    got = session.settings.always_revalidate
+    session.close()
+    assert got is always_revalidate, (
+        'Ключ `--revalidate` должен включать перепроверку всего кеша'
+    )
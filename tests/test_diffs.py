@@ -0,0 +1,37 @@
+try:
+    from src import diffs
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `diffs.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `diffs.py`'
+
+
+def test_diff_rows():
+    previous = [('1', 'Active'), ('8', 'Active'), ('255', 'Draft')]
+    current = [(1, 'Active'), (255, 'Final'), (638, 'Draft')]
+    calls = []
+
+    def load_previous():
+        calls.append(1)
+        return iter(previous)
+
+    assert list(diffs.diff_rows(load_previous, current)) == [
+        ('Изменено', 255, 'Final'),
+        ('Добавлено', 638, 'Draft'),
+        ('Удалено', '8', 'Active'),
+    ], 'Строки сравниваются по первой колонке, а числа — как в CSV'
+    assert len(calls) == 2, (
+        'Прошлый результат читается потоком: один раз для хешей '
+        'и один раз для удалённых строк'
+    )
+
+
+def test_diff_rows_without_removed_reads_previous_once():
+    calls = []
+
+    def load_previous():
+        calls.append(1)
+        return iter([('1', 'Active')])
+
+    assert list(diffs.diff_rows(load_previous, [('1', 'Active')])) == []
+    assert len(calls) == 1
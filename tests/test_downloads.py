@@ -0,0 +1,184 @@
+import json
+
+import requests
+import requests_mock
+from requests_cache import CachedSession
+try:
+    from src import downloads
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `downloads.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `downloads.py`'
+
+ARCHIVES = 'https://docs.python.org/3/archives/'
+ZIP_URL = ARCHIVES + 'python-3.12-docs-pdf-a4.zip'
+EPUB_URL = ARCHIVES + 'python-3.12-docs.epub'
+ARCHIVE = b'PK\x03\x04' + bytes(1024)
+ETAG = '"abc"'
+
+
+def make_session(adapter):
+    session = requests.Session()
+    session.mount('https://', adapter)
+    return session
+
+
+def archive_adapter():
+    adapter = requests_mock.Adapter()
+
+    def not_modified(request):
+        return request.headers.get('If-None-Match') == ETAG
+
+    for url in (ZIP_URL, EPUB_URL):
+        adapter.register_uri('GET', url, content=ARCHIVE, headers={
+            'ETag': ETAG, 'Content-Length': str(len(ARCHIVE))
+        })
+        adapter.register_uri(
+            'GET', url, status_code=304, additional_matcher=not_modified
+        )
+    return adapter
+
+
+def test_archive_format():
+    assert downloads.archive_format(
+        'archives/python-3.12-docs-html.tar.bz2'
+    ) == 'html.tar.bz2'
+    assert downloads.archive_format(
+        'archives/python-3.12-docs.epub'
+    ) == 'epub'
+    assert downloads.archive_format('download.html') is None
+
+
+def test_download_archives(tmp_path):
+    adapter = archive_adapter()
+    session = make_session(adapter)
+    paths = downloads.download_archives(
+        session, [ZIP_URL, EPUB_URL], tmp_path
+    )
+    assert [path.name for path in paths] == [
+        'python-3.12-docs-pdf-a4.zip', 'python-3.12-docs.epub'
+    ], 'Должны сохраняться все выбранные архивы'
+    assert all(path.read_bytes() == ARCHIVE for path in paths)
+    objects = sorted(path.name for path in (tmp_path / 'objects').iterdir())
+    assert len(objects) == 2 and objects[0].endswith('.epub'), (
+        'Архивы должны храниться по хешу содержимого с расширением'
+    )
+    manifest = json.loads((tmp_path / 'manifest.json').read_text())
+    assert manifest[ZIP_URL]['size'] == len(ARCHIVE)
+    assert manifest[ZIP_URL]['etag'] == ETAG
+
+    downloads.download_archives(session, [ZIP_URL], tmp_path)
+    assert adapter.last_request.headers['If-None-Match'] == ETAG, (
+        'Целый архив должен перепроверяться условным запросом'
+    )
+    assert len(list((tmp_path / 'objects').iterdir())) == 2
+    assert (tmp_path / 'python-3.12-docs-pdf-a4.zip').exists()
+
+
+def test_download_archives_size_mismatch(tmp_path):
+    adapter = requests_mock.Adapter()
+    adapter.register_uri('GET', ZIP_URL, content=ARCHIVE, headers={
+        'Content-Range': f'bytes 0-{len(ARCHIVE) - 1}/{len(ARCHIVE) * 2}'
+    })
+    paths = downloads.download_archives(
+        make_session(adapter), [ZIP_URL], tmp_path
+    )
+    assert paths == [], 'Архив неверного размера не должен сохраняться'
+    assert not list(tmp_path.glob('*.zip'))
+
+
+def test_download_archives_bypass_cache(tmp_path):
+    session = CachedSession(backend='memory')
+    session.mount('https://', archive_adapter())
+    urls = [ARCHIVES + f'python-3.12-docs-{name}.zip' for name in (
+        'pdf-a4', 'html', 'text'
+    )]
+    for url in urls:
+        session.get_adapter(url).register_uri('GET', url, content=ARCHIVE)
+    paths = downloads.download_archives(session, urls, tmp_path, workers=3)
+    assert len(paths) == len(urls)
+    assert not list(session.cache.responses.keys()), (
+        'Архивы не должны попадать в кеш ответов сессии'
+    )
+
+
+def range_adapter(archive, etag):
+    """Сервер, который докачивает архив только при совпадении If-Range."""
+    adapter = requests_mock.Adapter()
+
+    def resumable(request):
+        return (
+            'Range' in request.headers
+            and request.headers.get('If-Range', etag) == etag
+        )
+
+    half = len(archive) // 2
+    adapter.register_uri('GET', ZIP_URL, content=archive, headers={
+        'ETag': etag, 'Content-Length': str(len(archive))
+    })
+    adapter.register_uri(
+        'GET', ZIP_URL, status_code=206, content=archive[half:],
+        additional_matcher=resumable, headers={
+            'ETag': etag,
+            'Content-Range': f'bytes {half}-{len(archive) - 1}/{len(archive)}'
+        }
+    )
+    return adapter
+
+
+def write_part(tmp_path, content, validator=None):
+    part_path = tmp_path / 'python-3.12-docs-pdf-a4.zip.part'
+    part_path.write_bytes(content)
+    if validator is not None:
+        (tmp_path / (part_path.name + '.validator')).write_text(validator)
+
+
+def test_download_archives_resumes_unchanged(tmp_path):
+    archive = bytes(range(256)) * 4
+    write_part(tmp_path, archive[:len(archive) // 2], ETAG)
+    adapter = range_adapter(archive, ETAG)
+    paths = downloads.download_archives(
+        make_session(adapter), [ZIP_URL], tmp_path
+    )
+    assert adapter.last_request.headers['Range'] == 'bytes=512-'
+    assert paths[0].read_bytes() == archive
+    assert not list(tmp_path.glob('*.part*'))
+
+
+def test_download_archives_restarts_changed(tmp_path):
+    archive = bytes(range(256)) * 4
+    write_part(tmp_path, ARCHIVE[:len(archive) // 2], '"old"')
+    paths = downloads.download_archives(
+        make_session(range_adapter(archive, ETAG)), [ZIP_URL], tmp_path
+    )
+    assert paths[0].read_bytes() == archive, (
+        'Изменившийся на сервере архив нужно скачать заново, '
+        'а не дописывать к старому началу'
+    )
+
+
+def test_download_archives_drops_part_without_validator(tmp_path):
+    archive = bytes(range(256)) * 4
+    write_part(tmp_path, ARCHIVE[:len(archive) // 2])
+    adapter = range_adapter(archive, ETAG)
+    paths = downloads.download_archives(
+        make_session(adapter), [ZIP_URL], tmp_path
+    )
+    assert 'Range' not in adapter.last_request.headers
+    assert paths[0].read_bytes() == archive
+
+
+def test_download_archives_prunes_old_objects(tmp_path):
+    for archive, etag in ((ARCHIVE, ETAG), (ARCHIVE * 2, '"new"')):
+        adapter = requests_mock.Adapter()
+        adapter.register_uri('GET', ZIP_URL, content=archive, headers={
+            'ETag': etag
+        })
+        downloads.download_archives(
+            make_session(adapter), [ZIP_URL], tmp_path
+        )
+    objects = list((tmp_path / 'objects').iterdir())
+    assert len(objects) == 1, (
+        'Архивы, на которые не ссылается манифест, нужно удалять'
+    )
+    assert objects[0].read_bytes() == ARCHIVE * 2
@@ -0,0 +1,59 @@
+from argparse import Namespace
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from src import extract_cache
+except ModuleNotFoundError:
+    assert False, (
+        'Убедитесь что в директории `src` есть файл `extract_cache.py`'
+    )
+except ImportError:
+    assert False, (
+        'Убедитесь что в директории `src` есть файл `extract_cache.py`'
+    )
+
+URL = 'https://peps.python.org/pep-0008/'
+
+
+def page(text, url=URL):
+    return Namespace(url=url, text=text, content=text.encode())
+
+
+def test_cache_evicts_least_recently_used():
+    cache = extract_cache.ExtractCache(budget=600)
+    for key in 'abc':
+        cache.put(key, 'x' * 50)
+    assert cache.get('a') == 'x' * 50
+    cache.put('d', 'x' * 50)
+    assert cache.get('b') is extract_cache.MISSING, (
+        'При превышении бюджета вытесняется давно не использованная запись'
+    )
+    assert cache.get('a') == 'x' * 50
+    assert cache.size <= cache.budget
+    cache.put('huge', 'x' * 1000)
+    assert cache.get('huge') is extract_cache.MISSING, (
+        'Запись больше всего бюджета не кешируется'
+    )
+
+
+def test_cached_parse_reparses_changed_content(monkeypatch):
+    monkeypatch.setattr(
+        extract_cache, 'EXTRACT_CACHE', extract_cache.ExtractCache()
+    )
+    calls = []
+
+    def parse(text):
+        calls.append(text)
+        return text.upper()
+
+    assert extract_cache.cached_parse(parse, page('active')) == 'ACTIVE'
+    assert extract_cache.cached_parse(parse, page('active')) == 'ACTIVE'
+    assert len(calls) == 1, 'Страница с тем же содержимым не разбирается'
+    assert extract_cache.cached_parse(parse, page('final')) == 'FINAL'
+    assert len(calls) == 2, 'Изменившаяся страница разбирается заново'
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = extract_cache.submit_cached_parse(
+            executor, parse, page('final')
+        )
+        assert future.result() == 'FINAL'
+    assert len(calls) == 2
@@ -0,0 +1,80 @@
+import time
+from argparse import Namespace
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests_cache
+from conftest import get_offline_adapter
+try:
+    from src import frontier, main
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `frontier.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `frontier.py`'
+
+
+@pytest.mark.parametrize('url, expected', [
+    ('HTTPS://Docs.Python.org:443/3/', 'https://docs.python.org/3/'),
+    ('https://docs.python.org', 'https://docs.python.org/'),
+    (
+        'https://docs.python.org/3/whatsnew/../download.html#pdf',
+        'https://docs.python.org/3/download.html'
+    ),
+    ('https://peps.python.org:8080/', 'https://peps.python.org:8080/'),
+    ('https://peps.python.org/?page=2', 'https://peps.python.org/?page=2'),
+])
+def test_normalize_url(url, expected):
+    assert frontier.normalize_url(url) == expected
+
+
+def test_frontier_fetches_each_page_once():
+    calls = []
+
+    def load(url):
+        calls.append(url)
+        time.sleep(0.2)
+        return Namespace(url='https://peps.python.org/pep-0008/')
+
+    pages = frontier.Frontier()
+    urls = ['https://peps.python.org/pep-0008/#abstract'] * 20
+    with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+        got = list(executor.map(lambda url: pages.fetch(url, load), urls))
+    assert len(calls) == 1, (
+        'Одновременные запросы одного адреса должны загружаться один раз'
+    )
+    assert all(response is got[0] for response in got)
+    assert not pages.pending, (
+        'Загруженные страницы не должны оставаться в памяти'
+    )
+
+
+def test_frontier_follows_redirect_alias():
+    calls = []
+
+    def load(url):
+        calls.append(url)
+        return Namespace(url='https://peps.python.org/')
+
+    pages = frontier.Frontier()
+    for _ in range(2):
+        pages.fetch('https://www.python.org/dev/peps/', load)
+    assert calls == [
+        'https://www.python.org/dev/peps/', 'https://peps.python.org/'
+    ], 'Адрес, который перенаправил на другой, загружается по итоговому'
+
+
+def test_modes_share_pages(capsys):
+    adapter = get_offline_adapter()
+    session = requests_cache.CachedSession(backend='memory')
+    session.mount('https://', adapter)
+    cli_args = Namespace(
+        mode=['pep', 'pep-metadata', 'pep'], output=None, metrics=None
+    )
+    main.run_modes(list(main.mode_runs(cli_args)), session)
+    assert adapter.call_count == 7, (
+        'Общий список и карточки PEP должны загружаться из сети один раз '
+        'для всех режимов запуска'
+    )
+    out = capsys.readouterr().out
+    assert out.count('Статус Количество') == 1, 'Повторы режимов пропускаются'
+    assert 'Номер Название' in out
@@ -0,0 +1,131 @@
+import json
+import logging
+import queue
+import sys
+import time
+from logging.handlers import QueueListener
+
+import requests
+try:
+    from src import log_handlers, utils
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `log_handlers.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `log_handlers.py`'
+
+
+def make_record(msg, *args, lineno=10, level=logging.ERROR):
+    return logging.LogRecord(
+        'root', level, 'parser.py', lineno, msg, args, None
+    )
+
+
+def test_json_formatter():
+    formatter = log_handlers.JsonFormatter()
+    try:
+        raise ValueError('ошибка')
+    except ValueError:
+        record = make_record('Страница %s', 'pep-0001')
+        record.exc_info = sys.exc_info()
+    got = json.loads(formatter.format(record))
+    assert got['level'] == 'ERROR', 'В записи лога нет уровня'
+    assert got['message'] == 'Страница pep-0001', (
+        'Сообщение в JSON должно быть отформатировано с аргументами'
+    )
+    assert 'ValueError' in got['exception'], (
+        'В JSON-записи лога должна быть трассировка исключения'
+    )
+
+
+def test_rate_limit_filter(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(log_handlers.time, 'monotonic', lambda: now[0])
+    rate_filter = log_handlers.RateLimitFilter(2, 60)
+    passed = [
+        rate_filter.filter(make_record('Ошибка')) for _ in range(5)
+    ]
+    assert passed == [True, True, False, False, False], (
+        'Фильтр должен пропускать не больше `limit` записей за интервал'
+    )
+    assert rate_filter.filter(make_record('Другая', lineno=20)), (
+        'Записи из другого места вызова не должны ограничиваться'
+    )
+    now[0] = 61.0
+    record = make_record('Ошибка')
+    assert rate_filter.filter(record), (
+        'После интервала записи должны пропускаться снова'
+    )
+    assert 'пропущено похожих сообщений: 3' in record.getMessage(), (
+        'К первой записи нового интервала нужно дописать число пропущенных'
+    )
+
+
+def test_rate_limit_filter_skips_info():
+    rate_filter = log_handlers.RateLimitFilter(2, 60)
+    assert all(
+        rate_filter.filter(make_record('Сводка', level=logging.INFO))
+        for _ in range(20)
+    ), 'Записи уровня INFO, например сводка по этапам, не ограничиваются'
+
+
+def test_suppressed_counts_reported_on_stop():
+    rate_filter = log_handlers.RateLimitFilter(1, 60)
+    for page in range(4):
+        rate_filter.filter(make_record('Ошибка на странице %s', page))
+    handler = ListHandler()
+    listener = QueueListener(queue.SimpleQueue(), handler)
+    listener.start()
+    log_handlers.stop_listener(listener, rate_filter)
+    assert handler.messages == [
+        'Ошибка на странице 3 (пропущено похожих сообщений: 3)'
+    ], 'При остановке лога нужно сообщить о всех отброшенных записях'
+    assert not rate_filter.pop_suppressed()
+
+
+def test_rate_limit_filter_disabled():
+    rate_filter = log_handlers.RateLimitFilter(0, 60)
+    assert all(
+        rate_filter.filter(make_record('Ошибка')) for _ in range(100)
+    ), 'Лимит 0 должен отключать ограничение'
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def log_in_worker(text):
+    logging.warning('Разбор в процессе: %s', text)
+    return len(text)
+
+
+def make_response(url, text):
+    response = requests.Response()
+    response.url = url
+    response.encoding = 'utf-8'
+    response._content = text.encode()
+    return response
+
+
+def test_worker_logs_reach_listener(monkeypatch):
+    # utils импортирует модуль как `log_handlers`, а не `src.log_handlers`
+    handlers_module = sys.modules[utils.worker_logging.__module__]
+    handler = ListHandler()
+    monkeypatch.setattr(handlers_module, 'WORKER_QUEUE', None)
+    monkeypatch.setattr(handlers_module, 'LISTENER_HANDLERS', (handler,))
+    responses = [
+        make_response(f'https://example.com/worker-{index}', f'page {index}')
+        for index in range(3)
+    ]
+    got = list(utils.parse_all(log_in_worker, responses, processes=2))
+    assert got == [6, 6, 6]
+    deadline = time.monotonic() + 5
+    while len(handler.messages) < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert sorted(handler.messages) == [
+        f'Разбор в процессе: page {index}' for index in range(3)
+    ], 'Записи лога из процессов пула должны доходить до обработчиков'
@@ -1,5 +1,10 @@
+import inspect
+import subprocess
+import sys
 import pytest
 from pathlib import Path
+
+from conftest import SRC_DIR
 try:
     from src import main
 except ModuleNotFoundError:
@@ -33,9 +38,10 @@ def test_main_file():
 def test_whats_new(mock_session):
     got = main.whats_new(mock_session)
     header = ('Ссылка на статью', 'Заголовок', 'Редактор, Автор')
-    assert isinstance(got, list), (
-        'Функция `whats_new` должна возвращать объект типа `list`'
+    assert inspect.isgenerator(got), (
+        'Функция `whats_new` должна отдавать строки результата генератором'
     )
+    got = list(got)
     assert len(got) > 0, (
         'Убедитесь что функция `whats_new` модуля `main.py` '
         'возвращает непустой список'
@@ -54,9 +60,11 @@ def test_whats_new(mock_session):
 @pytest.mark.skip()
 def test_latest_versions(mock_session):
     got = main.latest_versions(mock_session)
-    assert isinstance(got, list), (
-        'Функция `latest_versions` должна возвращать объект типа `list`'
+    assert inspect.isgenerator(got), (
+        'Функция `latest_versions` должна отдавать строки результата '
+        'генератором'
     )
+    got = list(got)
     assert isinstance(got[0], tuple), (
         'Функция `latest_versions` должна вернуть список `result`, '
         'элементами которого должны быть объекты типа `tuple`'
@@ -123,7 +131,10 @@ def test_mode_to_function():
             f'{name_func} - это строка.'
         )
         assert (
-            name_func in ['whats-new', 'latest-versions', 'download', 'pep']
+            name_func in [
+                'whats-new', 'latest-versions', 'download', 'pep',
+                'pep-metadata'
+            ]
         ), (
             'В модуле `main.py` в объекте `MODE_TO_FUNCTION` '
             f'нет ключа `{name_func}`'
@@ -134,9 +145,32 @@ def test_mode_to_function():
         )
         assert (
             func.__name__ in [
-                'whats_new', 'latest_versions', 'download', 'pep'
+                'whats_new', 'latest_versions', 'download', 'pep',
+                'pep_metadata'
             ]
         ), (
             'В модуле `main.py` в объекте `MODE_TO_FUNCTION` '
             f'нет значения {func}'
         )
+
+
+HEAVY_MODULES = ('bs4', 'lxml', 'requests', 'requests_cache', 'tqdm')
+
+
+def test_main_import_is_lazy():
+    got = subprocess.run(
+        [
+            sys.executable, '-c',
+            'import sys, main\n'
+            f'print(*(name for name in {HEAVY_MODULES} '
+            'if name in sys.modules))'
+        ],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert not got.stdout.split(), (
+        'При импорте `main.py` не должны загружаться модули '
+        f'{got.stdout.strip()}: импортируйте их в функциях режимов'
+    )
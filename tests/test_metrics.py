@@ -0,0 +1,50 @@
+import json
+from argparse import Namespace
+
+import pytest
+try:
+    from src import metrics
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `metrics.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `metrics.py`'
+
+
+@pytest.fixture(autouse=True)
+def clean_stats():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_measure_records_calls_and_time():
+    for _ in range(3):
+        with metrics.measure('parse'):
+            pass
+    metrics.record('parse', bytes=10)
+    stats = metrics.STATS['parse']
+    assert stats['calls'] == 3, (
+        'Функция `measure` должна считать количество вызовов этапа'
+    )
+    assert stats['seconds'] >= 0
+    assert stats['bytes'] == 10
+
+
+def test_prometheus_export():
+    metrics.record('fetch', calls=2, cache_hits=1)
+    got = metrics.to_prometheus()
+    assert 'bs4_parser_stage_calls_total{stage="fetch"} 2' in got, (
+        'Метрики должны выгружаться в текстовом формате Prometheus'
+    )
+    assert 'bs4_parser_stage_cache_hits_total{stage="fetch"} 1' in got
+
+
+def test_export_metrics_json(monkeypatch, tmp_path):
+    monkeypatch.setattr(metrics, 'BASE_DIR', tmp_path)
+    metrics.record('output', calls=1)
+    metrics.export_metrics(Namespace(mode='pep', metrics='json'))
+    files = list((tmp_path / 'metrics').glob('pep_*.json'))
+    assert len(files) == 1, (
+        'Метрики должны сохраняться в директорию `metrics`'
+    )
+    assert json.loads(files[0].read_text())['output']['calls'] == 1
@@ -90,3 +90,63 @@ def test_output_file():
     assert hasattr(outputs, 'file_output'), (
         'Напишите функцию `file_output` в модуле `output.py`'
     )
+
+
+@pytest.mark.parametrize('output, extension, package', [
+    ('jsonl', 'jsonl', None),
+    ('csv-gzip', 'csv.gz', None),
+    ('csv-zstd', 'csv.zst', 'zstandard'),
+    ('sqlite', 'sqlite3', None),
+    ('arrow', 'arrow', 'pyarrow'),
+    ('parquet', 'parquet', 'pyarrow'),
+])
+def test_control_output_formats(
+        monkeypatch, tmp_path, records, output, extension, package
+):
+    if package:
+        pytest.importorskip(package)
+    monkeypatch.setattr(outputs, 'BASE_DIR', Path(tmp_path))
+    records = records('pep')
+    outputs.control_output(iter(records), cli_args('pep', output))
+    output_files = list(Path(tmp_path).glob(f'results/pep_*.{extension}'))
+    assert len(output_files) == 1, (
+        f'Убедитесь что вывод `{output}` сохраняет файл '
+        f'<имя-режима_дата>.{extension} в директорию `results`'
+    )
+    if output == 'jsonl':
+        lines = output_files[0].read_text(encoding='utf-8').splitlines()
+        assert len(lines) == len(records) - 1, (
+            'Вывод `jsonl` должен содержать по строке на каждую запись'
+        )
+
+
+def test_delta_output(monkeypatch, tmp_path):
+    monkeypatch.setattr(outputs, 'BASE_DIR', Path(tmp_path))
+    results_dir = Path(tmp_path) / 'results'
+    results_dir.mkdir()
+    (results_dir / 'pep_2023-12-15_13-46-18.csv').write_text(
+        'Статус,Количество\nActive,2\nFinal,1\nDraft,3\n', encoding='utf-8'
+    )
+
+    def run(records):
+        outputs.control_output(iter(records), cli_args('pep', 'delta'))
+        deltas = list(results_dir.glob('pep_*.delta.csv'))
+        got = [
+            path.read_text(encoding='utf-8').splitlines() for path in deltas
+        ]
+        for path in deltas:
+            path.unlink()
+        return got
+
+    records = [('Статус', 'Количество'), ('Active', 2), ('Final', 2)]
+    assert run(records) == [[
+        '"Изменение","Статус","Количество"',
+        '"Изменено","Final","2"',
+        '"Удалено","Draft","3"',
+    ]], 'Вывод `delta` должен сохранять только отличия от прошлого запуска'
+    assert run(records) == [], (
+        'Если результат не изменился, файл с отличиями не создаётся'
+    )
+    assert (results_dir / 'pep_latest.csv').read_text(
+        encoding='utf-8'
+    ).splitlines() == ['"Статус","Количество"', '"Active","2"', '"Final","2"']
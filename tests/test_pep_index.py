@@ -0,0 +1,79 @@
+from argparse import Namespace
+
+import requests
+try:
+    from src import main, pep_index
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `pep_index.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `pep_index.py`'
+
+URL = 'https://peps.python.org/pep-0008/'
+
+
+def make_response(text):
+    response = requests.Response()
+    response.url = URL
+    response.encoding = 'utf-8'
+    response._content = text.encode()
+    return response
+
+
+def counting_parse(calls):
+    def parse(text):
+        calls.append(text)
+        return text.split(':')[1] or None
+    return parse
+
+
+def test_get_status_parses_only_changed_cards(tmp_path):
+    index = pep_index.open_index(tmp_path / 'index.sqlite3')
+    calls = []
+    parse = counting_parse(calls)
+    got = pep_index.get_status(index, URL, make_response('Status:Draft'), parse)
+    assert got == 'Draft'
+    got = pep_index.get_status(index, URL, make_response('Status:Draft'), parse)
+    assert got == 'Draft' and len(calls) == 1, (
+        'Карточка с тем же хешем не должна разбираться повторно'
+    )
+    got = pep_index.get_status(index, URL, make_response('Status:Final'), parse)
+    assert got == 'Final' and len(calls) == 2, (
+        'Изменившаяся карточка должна разбираться заново'
+    )
+
+
+def test_status_counts_since(tmp_path, monkeypatch):
+    index = pep_index.open_index(tmp_path / 'index.sqlite3')
+    parse = counting_parse([])
+    times = iter([
+        '2024-01-01T00:00:00+00:00',
+        '2024-01-02T00:00:00+00:00',
+        '2024-01-02T00:00:00+00:00',
+        '2024-01-02T00:00:00+00:00',
+    ])
+    monkeypatch.setattr(pep_index, 'utc_now', lambda: next(times))
+    for url, text in [
+        ('https://peps.python.org/pep-0001/', 'Status:Active'),
+        ('https://peps.python.org/pep-0008/', 'Status:Active'),
+        ('https://peps.python.org/pep-0255/', 'Status:Final'),
+        ('https://peps.python.org/pep-0315/', 'Status:'),
+    ]:
+        pep_index.get_status(index, url, make_response(text), parse)
+    assert pep_index.status_counts(index, '2024-01-02T00:00:00+00:00') == [
+        ('Active', 1), ('Final', 1)
+    ], (
+        'Считаться должны только карточки, проверенные в этом запуске, '
+        'и только с распознанным статусом'
+    )
+
+
+def test_incremental_pep_matches_full_run(offline_session, monkeypatch,
+                                          tmp_path):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    expected = list(main.pep(offline_session))
+    for _ in range(2):
+        got = list(main.pep(offline_session, Namespace(incremental=True)))
+        assert got == expected, (
+            'Инкрементальный режим должен давать ту же таблицу, '
+            'что и полный разбор'
+        )
@@ -0,0 +1,101 @@
+import datetime as dt
+
+from conftest import HTML_DIR
+try:
+    from src import main, pep_metadata
+except ModuleNotFoundError:
+    assert False, (
+        'Убедитесь что в директории `src` есть файл `pep_metadata.py`'
+    )
+except ImportError:
+    assert False, (
+        'Убедитесь что в директории `src` есть файл `pep_metadata.py`'
+    )
+
+
+def test_parse_pep_metadata():
+    text = (HTML_DIR / 'pep-0255.html').read_text(encoding='utf-8')
+    record = main.parse_pep_metadata(text)
+    assert isinstance(record, main.PepRecord)
+    assert not hasattr(record, '__dict__'), (
+        'Запись о PEP должна хранить поля в `__slots__`'
+    )
+    assert record.number == 255
+    assert record.title == 'Simple Generators'
+    assert record.status == 'Final'
+    assert record.type == 'Standards Track'
+    assert record.created == dt.date(2001, 5, 18)
+    assert record.python_version == '2.2'
+    assert record.authors == (
+        'Neil Schemenauer', 'Tim Peters', 'Magnus Lie Hetland'
+    )
+    assert record.requires == (234,)
+    assert record.post_history == ('14-Jun-2001', '23-Jun-2001'), (
+        'Поле `Post-History` карточки должно сохраняться в записи'
+    )
+
+
+def test_parse_pep_metadata_skips_site_header():
+    text = (
+        '<header><h1>Python Enhancement Proposals</h1></header>'
+        '<h1 class="page-title">PEP 8 – Style Guide for Python Code</h1>'
+        '<dl class="rfc2822 field-list simple">'
+        '<dt>Status<span class="colon">:</span></dt><dd>Active</dd></dl>'
+    )
+    record = main.parse_pep_metadata(text)
+    assert (record.number, record.title) == (
+        8, 'Style Guide for Python Code'
+    ), 'Заголовок сайта над карточкой не должен читаться как название PEP'
+
+
+def test_record_keeps_every_field():
+    record = pep_metadata.PepRecord.from_card('PEP 3333 – Web Gateway', [
+        ('Author', 'Phillip J. Eby <pje at telecommunity.com>, Guido'),
+        ('Discussions-To', 'web-sig@python.org'),
+        ('Status', 'Final'),
+        ('Topic', 'Packaging'),
+        ('Sponsor', 'Barry Warsaw <barry at python.org>'),
+        ('PEP-Delegate', 'Paul Moore'),
+        ('Replaces', '333'),
+        ('Superseded-By', '3334, 3335'),
+        ('Resolution', 'Python-Dev message'),
+        ('Content-Type', 'text/x-rst'),
+    ])
+    assert record.authors == ('Phillip J. Eby', 'Guido'), (
+        'Адреса авторов в карточке не должны попадать в их имена'
+    )
+    assert record.discussions_to == 'web-sig@python.org'
+    assert record.topic == 'Packaging'
+    assert record.sponsor == 'Barry Warsaw'
+    assert record.delegate == 'Paul Moore'
+    assert record.replaces == (333,)
+    assert record.superseded_by == (3334, 3335)
+    assert record.resolution == 'Python-Dev message'
+    assert record.extra == (('Content-Type', 'text/x-rst'),), (
+        'Поля карточки без атрибута должны сохраняться в `extra`'
+    )
+    row = record.as_row()
+    assert len(row) == len(main.PEP_METADATA_TABLE[0]), (
+        'Строка записи должна соответствовать заголовку таблицы'
+    )
+    assert row[-3:] == ('333', '3334, 3335', 'Content-Type: text/x-rst')
+
+
+def test_record_without_optional_fields():
+    record = pep_metadata.PepRecord.from_card(
+        'PEP 1 – PEP Purpose and Guidelines',
+        [('Status', 'Active'), ('Created', 'unknown'), ('Post-History', '')]
+    )
+    assert record.as_row() == (
+        1, 'PEP Purpose and Guidelines', 'Active', *[''] * 14
+    ), 'Отсутствующие поля карточки выводятся пустыми строками'
+    assert pep_metadata.PepRecord.from_card('Без номера', []) is None
+
+
+def test_pep_metadata_mode(offline_session):
+    header, *rows = main.pep_metadata(offline_session)
+    assert header == main.PEP_METADATA_TABLE[0]
+    assert [row[0] for row in rows] == [1, 8, 255, 315, 638, 401], (
+        'Режим `pep-metadata` должен вернуть по строке на каждую карточку '
+        'в порядке общего списка'
+    )
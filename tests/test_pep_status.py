@@ -0,0 +1,118 @@
+import json
+import logging
+from argparse import Namespace
+
+import pytest
+from bs4 import BeautifulSoup
+from conftest import HTML_DIR
+try:
+    from src import main, pep_status
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `pep_status.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `pep_status.py`'
+
+PEP_API_URL = 'https://peps.python.org/api/peps.json'
+
+
+@pytest.mark.parametrize('file_name, status', [
+    ('pep-0001.html', 'Active'),
+    ('pep-0008.html', 'Active'),
+    ('pep-0255.html', 'Final'),
+    ('pep-0315.html', 'Rejected'),
+    ('pep-0401.html', 'April Fool!'),
+    ('pep-0638.html', 'Draft'),
+])
+def test_parse_status(file_name, status):
+    text = (HTML_DIR / file_name).read_text(encoding='utf-8')
+    assert pep_status.parse_status(text) == status, (
+        f'Статус в карточке `{file_name}` распознан неверно'
+    )
+
+
+def test_preview_status():
+    soup = BeautifulSoup(
+        (HTML_DIR / 'pep_index.html').read_text(encoding='utf-8'), 'lxml'
+    )
+    rows = soup.select('#numerical-index tbody tr')
+    assert [pep_status.preview_status(row) for row in rows] == [
+        'A', 'A', 'F', 'R', '', 'W'
+    ]
+
+
+def test_allowed_statuses():
+    assert pep_status.is_expected('A', 'Accepted')
+    assert pep_status.is_expected('', 'Draft')
+    assert not pep_status.is_expected('F', 'Draft')
+    assert not pep_status.is_expected('X', 'Final'), (
+        'Для неизвестного сокращения ни один статус не ожидается'
+    )
+    assert pep_status.expected_statuses('A') == 'Accepted, Active'
+
+
+def test_pep_mode_counts_statuses(offline_session, caplog):
+    with caplog.at_level(logging.WARNING):
+        got = list(main.pep(offline_session))
+    assert got == [
+        ('Статус', 'Количество'),
+        ('Active', 2),
+        ('Final', 1),
+        ('Rejected', 1),
+        ('Draft', 1),
+        ('April Fool!', 1),
+        ('Total', 6),
+    ]
+    assert 'pep-0401' in caplog.text, (
+        'Несовпадение статуса в карточке и в общем списке '
+        'должно попадать в лог'
+    )
+
+
+def test_pep_mode_parses_in_processes(offline_session):
+    expected = list(main.pep(offline_session))
+    got = list(main.pep(offline_session, Namespace(processes=2)))
+    assert got == expected, (
+        'Разбор карточек в пуле процессов должен давать тот же результат'
+    )
+
+
+def test_pep_mode_json_engine(offline_session):
+    expected = list(main.pep(offline_session))
+    adapter = offline_session.get_adapter(PEP_API_URL)
+    adapter.reset()
+    got = list(main.pep(offline_session, Namespace(engine='json')))
+    assert got == expected, (
+        'Статусы из api/peps.json должны давать тот же результат, '
+        'что и разбор карточек'
+    )
+    assert not [
+        request.url for request in adapter.request_history
+        if '/pep-' in request.url
+    ], 'Движок json не должен загружать карточки PEP'
+
+
+def test_pep_mode_json_engine_fallback(offline_session):
+    expected = list(main.pep(offline_session))
+    offline_session.cache.clear()
+    offline_session.get_adapter(PEP_API_URL).register_uri(
+        'GET', PEP_API_URL, status_code=404, text='Not Found'
+    )
+    got = list(main.pep(offline_session, Namespace(engine='json')))
+    assert got == expected, (
+        'Если api/peps.json недоступен, статусы берутся из карточек'
+    )
+
+
+def test_pep_mode_spot_check(offline_session, caplog):
+    peps = json.loads((HTML_DIR / 'peps.json').read_text(encoding='utf-8'))
+    peps['255']['status'] = 'Draft'
+    offline_session.get_adapter(PEP_API_URL).register_uri(
+        'GET', PEP_API_URL, json=peps
+    )
+    with caplog.at_level(logging.WARNING):
+        list(main.pep(
+            offline_session, Namespace(engine='json', spot_check=6)
+        ))
+    assert 'pep-0255/ в api/peps.json (Draft)' in caplog.text, (
+        'Расхождение статуса из API с карточкой должно попадать в лог'
+    )
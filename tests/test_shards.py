@@ -0,0 +1,46 @@
+from argparse import Namespace
+
+import pytest
+try:
+    from src import main, shards
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `shards.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `shards.py`'
+
+SHARD_COUNT = 3
+
+
+def run_pep(session, **options):
+    return list(main.pep(session, Namespace(**options)))
+
+
+def test_shards_merge_into_full_result(monkeypatch, tmp_path, offline_session):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    expected = run_pep(offline_session)
+    partial_totals = []
+    for index in range(1, SHARD_COUNT + 1):
+        got = run_pep(offline_session, shard=(index, SHARD_COUNT))
+        partial_totals.append(got[-1][1])
+    assert sum(partial_totals) == expected[-1][1], (
+        'Каждая карточка PEP должна попадать ровно в один шард'
+    )
+    assert len(list(tmp_path.glob('shards/pep_*-of-3.json'))) == SHARD_COUNT
+    got = run_pep(offline_session, merge=True)
+    assert sorted(got[1:-1]) == sorted(expected[1:-1]), (
+        'Объединённый результат шардов должен совпадать с полным запуском'
+    )
+    assert got[0] == expected[0] and got[-1] == expected[-1]
+
+
+def test_merge_requires_all_shards(tmp_path):
+    shards.save_shard(tmp_path, (1, 2), {'Active': 1}, [])
+    with pytest.raises(shards.ShardMergeException, match='2 из 2'):
+        shards.merge_shards(tmp_path)
+    shards.save_shard(tmp_path, (2, 2), {'Final': 1, 'Active': 2}, [
+        ('https://peps.python.org/pep-0401/', 'April', 'W')
+    ])
+    assert shards.merge_shards(tmp_path) == (
+        {'Active': 3, 'Final': 1},
+        [('https://peps.python.org/pep-0401/', 'April', 'W')],
+    )
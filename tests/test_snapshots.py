@@ -0,0 +1,55 @@
+import pytest
+import requests
+try:
+    from src import snapshots
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `snapshots.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `snapshots.py`'
+
+URL = 'https://peps.python.org/pep-0008/'
+BODY = '<dl class="field-list"><dt>Status:</dt><dd>Active</dd></dl>'
+
+
+def test_archive_round_trip(tmp_path):
+    archive = snapshots.SnapshotArchive(tmp_path / 'archive.sqlite3')
+    archive.save(URL, 200, {
+        'Content-Type': 'text/html',
+        'Content-Encoding': 'gzip',
+    }, BODY.encode())
+    status_code, headers, body = archive.load(URL)
+    assert status_code == 200
+    assert body == BODY.encode(), 'Тело страницы должно сохраняться без потерь'
+    assert headers == {'Content-Type': 'text/html'}, (
+        'Заголовки сжатия не должны попадать в архив'
+    )
+    assert archive.load(URL + 'missing/') is None
+
+
+def test_replay_serves_archived_pages(tmp_path):
+    path = tmp_path / 'archive.sqlite3'
+    snapshots.SnapshotArchive(path).save(URL, 200, {}, BODY.encode())
+    session = requests.Session()
+    snapshots.mount_replay(session, path)
+    assert session.get(URL).text == BODY, (
+        'При воспроизведении страница должна отдаваться из архива'
+    )
+    with pytest.raises(snapshots.SnapshotMissException):
+        session.get(URL + 'missing/')
+
+
+def test_recorded_file_round_trip(tmp_path, monkeypatch):
+    archive_path = tmp_path / 'python-3.12-docs-pdf-a4.zip'
+    content = bytes(range(256)) * 1000
+    archive_path.write_bytes(content)
+    archive = snapshots.SnapshotArchive(tmp_path / 'archive.sqlite3')
+    monkeypatch.setattr(snapshots, 'RECORDER', archive)
+    monkeypatch.setattr(
+        type(archive_path), 'read_bytes',
+        lambda path: pytest.fail('Файл не должен читаться целиком')
+    )
+    snapshots.save_file(URL, archive_path)
+    snapshots.save_file(URL, archive_path)
+    assert archive.load(URL) == (200, {}, content), (
+        'Файл должен сохраняться в архив без потерь'
+    )
@@ -0,0 +1,43 @@
+try:
+    from src import tables
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `tables.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `tables.py`'
+
+
+def test_streaming_table_widths():
+    table = tables.StreamingTable(('Статус', 'Количество'))
+    lines = list(table.render([('A', 1), ('Active', 10)]))
+    assert lines[0] == '+--------+------------+', (
+        'Ширина столбцов должна определяться по заголовку и строкам'
+    )
+    assert lines[3] == '| A      | 1          |', (
+        'Значения в ячейках должны выравниваться по левому краю'
+    )
+    assert lines[0] == lines[2] == lines[-1], (
+        'Таблица должна обрамляться одинаковыми границами'
+    )
+
+
+def test_streaming_table_wraps_long_cells():
+    table = tables.StreamingTable(('Редактор',), max_width=10)
+    lines = list(table.render([('Raymond Hettinger',)]))
+    assert lines[3] == '| Raymond    |\n| Hettinger  |', (
+        'Длинные значения должны переноситься внутри ячейки'
+    )
+
+
+def test_streaming_table_is_lazy():
+    def rows():
+        yield ('1',)
+        yield ('2',)
+        raise AssertionError(
+            'Таблица не должна читать строки сверх выборки заранее'
+        )
+
+    table = tables.StreamingTable(('Номер',), sample_size=1)
+    lines = table.render(rows())
+    assert [next(lines) for _ in range(5)][-1] == '| 2     |', (
+        'Строки после выборки должны выводиться по мере поступления'
+    )
@@ -0,0 +1,115 @@
+import pytest
+import requests
+import requests_cache
+import requests_mock
+try:
+    from src import transport
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `transport.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `transport.py`'
+
+URL = 'https://docs.python.org/3/'
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    calls = []
+    monkeypatch.setattr(transport.time, 'sleep', calls.append)
+    monkeypatch.setattr(transport, 'TRANSPORT', transport.Transport(retries=2))
+    return calls
+
+
+def test_send_retries_transient_errors(sleeps):
+    session = requests.Session()
+    with requests_mock.Mocker(session=session) as mock:
+        mock.get(URL, [
+            {'status_code': 503},
+            {'exc': requests.ConnectionError},
+            {'text': 'ok', 'status_code': 200},
+        ])
+        got = transport.send(session, URL)
+    assert got.text == 'ok', (
+        'Функция `send` должна повторять запрос при временных ошибках'
+    )
+    assert len(sleeps) == 2
+
+
+def test_send_closes_retried_streams(sleeps):
+    session = requests.Session()
+    responses = []
+    session.hooks['response'].append(
+        lambda response, **kwargs: responses.append(response)
+    )
+    with requests_mock.Mocker(session=session) as mock:
+        mock.get(URL, [
+            {'status_code': 503, 'text': 'busy'},
+            {'text': 'ok', 'status_code': 200},
+        ])
+        got = transport.send(session, URL, stream=True)
+    assert responses[0].raw.closed, (
+        'Ответ, запрос которого повторяется, нужно закрыть, '
+        'чтобы соединение вернулось в пул'
+    )
+    assert not got.raw.closed and got.text == 'ok'
+
+
+@pytest.fixture
+def adapter_session(monkeypatch):
+    """Сессия с ThrottledAdapter, сетевой ответ которого подменён."""
+    calls = []
+
+    def network(adapter, request, *args, **kwargs):
+        calls.append(request.url)
+        return requests_mock.create_response(
+            request, status_code=adapter.status_code, text='ok'
+        )
+
+    monkeypatch.setattr(transport.HTTPAdapter, 'send', network)
+    adapter = transport.ThrottledAdapter()
+    adapter.status_code = 200
+
+    def make(session):
+        session.mount('https://', adapter)
+        return session, adapter, calls
+    return make
+
+
+def test_send_gives_up_and_opens_breaker(
+    sleeps, monkeypatch, adapter_session
+):
+    monkeypatch.setattr(transport, 'CIRCUIT_BREAKER_THRESHOLD', 1)
+    monkeypatch.setattr(transport, 'TRANSPORT', transport.Transport(retries=1))
+    session, adapter, calls = adapter_session(requests.Session())
+    adapter.status_code = 500
+    with pytest.raises(requests.HTTPError):
+        transport.send(session, URL)
+    with pytest.raises(transport.CircuitBreakerOpenException):
+        transport.send(session, URL)
+    assert len(calls) == 2, (
+        'После открытия предохранителя запросы к хосту не отправляются'
+    )
+
+
+def test_cache_hits_are_not_rate_limited(
+    sleeps, monkeypatch, adapter_session
+):
+    monkeypatch.setattr(
+        transport, 'TRANSPORT', transport.Transport(rate_limit=1)
+    )
+    session, adapter, calls = adapter_session(
+        requests_cache.CachedSession(backend='memory')
+    )
+    for _ in range(5):
+        assert transport.send(session, URL).text == 'ok'
+    assert len(calls) == 1
+    assert not any(sleeps), (
+        'Ответы из кеша не должны ждать ограничения частоты запросов'
+    )
+
+
+def test_backoff_delays_are_bounded():
+    delays = list(transport.backoff_delays(6, base=1, cap=4))
+    assert len(delays) == 6
+    assert all(0 <= delay <= min(4, 2 ** attempt)
+               for attempt, delay in enumerate(delays))
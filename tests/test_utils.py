@@ -1,3 +1,6 @@
+import threading
+import time
+
 import pytest
 import requests
 import requests_mock
@@ -54,3 +57,35 @@ def test_get_response(mock_session):
             'делает запрос к странице и возвращает ответ. \n'
             'Кстати: You are breathtaken!'
         )
+
+
+@pytest.mark.parametrize('workers, per_host, expected_limit', [
+    (8, 2, 2),
+    (6, 0, 6),
+])
+def test_fetch_all_order_and_host_limit(
+        monkeypatch, workers, per_host, expected_limit
+):
+    lock = threading.Lock()
+    active = []
+    peak = []
+
+    def fake_get_response(session, url):
+        with lock:
+            active.append(url)
+            peak.append(len(active))
+        time.sleep(0.02 * (1 + int(url.rsplit('/', 1)[1]) % 3))
+        with lock:
+            active.remove(url)
+        return url
+
+    monkeypatch.setattr(utils, 'get_response', fake_get_response)
+    urls = [f'https://peps.python.org/pep/{index}' for index in range(12)]
+    got = list(utils.fetch_all(None, urls, workers, per_host))
+    assert got == urls, (
+        'Функция `fetch_all` должна возвращать страницы в порядке ссылок'
+    )
+    assert max(peak) == expected_limit, (
+        'Одновременных запросов к хосту должно быть не больше лимита, '
+        'а без лимита на хост — столько же, сколько потоков'
+    )
@@ -0,0 +1,75 @@
+import datetime as dt
+from argparse import Namespace
+
+import pytest
+try:
+    from src import watch
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `watch.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `watch.py`'
+
+MOMENT = dt.datetime(2024, 1, 31, 23, 58, 30)
+
+
+@pytest.mark.parametrize('expression, expected', [
+    ('* * * * *', dt.datetime(2024, 1, 31, 23, 59)),
+    ('*/15 * * * *', dt.datetime(2024, 2, 1, 0, 0)),
+    ('30 6 * * 1-5', dt.datetime(2024, 2, 1, 6, 30)),
+    ('0 0 29 2 *', dt.datetime(2024, 2, 29, 0, 0)),
+    ('0 12 13 * 5', dt.datetime(2024, 2, 2, 12, 0)),
+])
+def test_cron_next_after(expression, expected):
+    assert watch.CronSchedule(expression).next_after(MOMENT) == expected, (
+        f'Неверный следующий запуск для расписания `{expression}`'
+    )
+
+
+@pytest.mark.parametrize('expression', [
+    '* * * *', '61 * * * *', '* * 0 * *', 'a * * * *'
+])
+def test_cron_rejects_invalid_expression(expression):
+    with pytest.raises(ValueError):
+        watch.CronSchedule(expression)
+
+
+def test_watch_outputs_only_changes(capsys):
+    runs = iter([
+        [('Статус', 'Количество'), ('Active', 2), ('Final', 1)],
+        [('Статус', 'Количество'), ('Active', 2), ('Final', 1)],
+        [('Статус', 'Количество'), ('Active', 3), ('Draft', 1)],
+    ])
+    cli_args = Namespace(mode='pep', output=None, metrics=None)
+    watch.watch(
+        [(cli_args, lambda session, cli_args: iter(next(runs)))],
+        None,
+        cli_args,
+        times=[MOMENT] * 3,
+    )
+    assert capsys.readouterr().out.splitlines() == [
+        'Изменение Статус Количество',
+        'Добавлено Active 2',
+        'Добавлено Final 1',
+        'Изменение Статус Количество',
+        'Изменено Active 3',
+        'Добавлено Draft 1',
+        'Удалено Final 1',
+    ], 'В режиме наблюдения выводятся только изменившиеся строки'
+
+
+def test_run_times_first_run():
+    start = dt.datetime.now()
+    watch_times = watch.run_times(Namespace(cron=None, watch=600))
+    first, second = next(watch_times), next(watch_times)
+    assert first - start < dt.timedelta(seconds=1), (
+        'С `--watch` первый запуск выполняется сразу'
+    )
+    assert second - first == dt.timedelta(seconds=600)
+    cron_times = watch.run_times(
+        Namespace(cron=watch.CronSchedule('0 0 1 1 *'), watch=None)
+    )
+    first = next(cron_times)
+    assert (first.month, first.day, first.hour, first.minute) == (1, 1, 0, 0), (
+        'С `--cron` первый запуск ждёт подходящего под расписание момента'
+    )
+    assert first > start